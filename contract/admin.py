@@ -1,9 +1,29 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
 from .models import (
     Category, Crop, CropListing, CropImage, Contract, 
-    ContractProgress, ProgressImage, Review, MarketPrice, MLModel
+    ContractProgress, ProgressImage, Review, MarketPrice, MarketPriceSummary, MLModel
 )
 
+class LargeTablePaginator(Paginator):
+    """
+    Paginator that uses PostgreSQL's row estimate instead of COUNT(*) for unfiltered large tables
+    """
+    ESTIMATE_THRESHOLD = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT reltuples FROM pg_class WHERE relname = %s', [query.model._meta.db_table])
+                row = cursor.fetchone()
+            if row and row[0] >= self.ESTIMATE_THRESHOLD:
+                return int(row[0])
+        return super().count
+
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'created_at']
@@ -14,26 +34,51 @@ class CropAdmin(admin.ModelAdmin):
     list_display = ['name', 'variety', 'category', 'current_market_price', 'created_at']
     list_filter = ['category', 'growing_season']
     search_fields = ['name', 'variety', 'scientific_name']
+    list_select_related = ['category']
 
 @admin.register(CropListing)
 class CropListingAdmin(admin.ModelAdmin):
     list_display = ['crop', 'farmer', 'quantity_available', 'expected_price_per_quintal', 'status', 'created_at']
     list_filter = ['status', 'organic_certified', 'quality_grade']
     search_fields = ['crop__name', 'farmer__username', 'farm_location']
+    list_select_related = ['crop', 'crop__category', 'farmer']
+    raw_id_fields = ('crop', 'farmer')
+    list_per_page = 25
+    date_hierarchy = 'created_at'
+    show_full_result_count = False
+    paginator = LargeTablePaginator
 
 @admin.register(Contract)
 class ContractAdmin(admin.ModelAdmin):
     list_display = ['contract_id', 'listing', 'buyer', 'farmer', 'total_contract_value', 'status', 'created_at']
     list_filter = ['status', 'payment_terms']
     search_fields = ['contract_id', 'buyer__username', 'farmer__username']
+    list_select_related = ['listing', 'listing__crop', 'buyer', 'farmer']
+    raw_id_fields = ('listing', 'buyer', 'farmer')
+    list_per_page = 25
+    date_hierarchy = 'created_at'
+    show_full_result_count = False
+    paginator = LargeTablePaginator
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
     list_display = ['reviewer', 'reviewee', 'overall_rating', 'would_recommend', 'created_at']
     list_filter = ['overall_rating', 'would_recommend']
+    list_select_related = ['reviewer', 'reviewee']
+    raw_id_fields = ('reviewer', 'reviewee', 'contract')
+    show_full_result_count = False
+
+@admin.register(MarketPrice)
+class MarketPriceAdmin(admin.ModelAdmin):
+    list_display = ['crop', 'market_name', 'location', 'price_per_quintal', 'date']
+    list_filter = ['crop', 'demand_level']
+    search_fields = ['crop__name', 'market_name', 'location']
+    list_select_related = ['crop']
+    list_per_page = 50
+    date_hierarchy = 'date'
 
 admin.site.register(CropImage)
 admin.site.register(ContractProgress)
 admin.site.register(ProgressImage)
-admin.site.register(MarketPrice)
+admin.site.register(MarketPriceSummary)
 admin.site.register(MLModel)
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Versioned cache groups.
+
+Entries are stored under their group's current version, so a whole group is
+invalidated by bumping one counter; the cache backend has no delete-by-prefix.
+"""
+import time
+
+from django.core.cache import cache
+
+# Per-user dashboard payloads are short-lived and dropped when the user's data changes
+DASHBOARD_CACHE_TIMEOUT = 60
+
+# market_trends is public and identical for every caller, so it is cached once
+MARKET_TRENDS_CACHE_KEY = 'market_trends'
+MARKET_TRENDS_CACHE_TIMEOUT = 120
+
+
+def _version_key(group):
+    return f'cache_version_{group}'
+
+
+def _new_version():
+    # Time based, so a version lost from the cache never comes back to an old value
+    return int(time.time())
+
+
+def get_version(group):
+    """Current cache version of a group"""
+    return cache.get_or_set(_version_key(group), _new_version, None)
+
+
+def invalidate(group):
+    """Invalidate every entry cached under the group"""
+    key = _version_key(group)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), None)
+
+
+def dashboard_cache_key(user_id):
+    return f'dashboard_{user_id}'
+
+
+def invalidate_contract(farmer_id, buyer_id):
+    """Drop the cached views a contract appears in: both parties' dashboards and market trends"""
+    cache.delete_many([
+        MARKET_TRENDS_CACHE_KEY,
+        dashboard_cache_key(farmer_id),
+        dashboard_cache_key(buyer_id),
+    ])
@@ -0,0 +1,85 @@
+import csv
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from contract import caching
+from contract.ml_services import invalidate_predictions, price_stats_cache_key
+from contract.models import Crop, MarketPrice
+
+OPTIONAL_TEXT_COLUMNS = ('season', 'weather_condition', 'demand_level')
+OPTIONAL_FLAG_COLUMNS = ('festival_season', 'export_demand')
+
+
+def _flag(value):
+    return (value or '').strip().lower() in ('1', 'true', 'yes')
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import MarketPrice history from a CSV file with columns crop_id, location, pincode, "
+        "price_per_quintal, market_name, date and optionally season, weather_condition, demand_level, "
+        "festival_season, export_demand. Rows already present (same crop, location, date, market) are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help="Path of the CSV file to import")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows per INSERT statement")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        crop_ids = set()
+        batch = []
+        processed = 0
+
+        # One transaction, so a bad row or an unknown crop leaves nothing half imported
+        with transaction.atomic(), open(options['csv_path'], newline='', encoding='utf-8') as csv_file:
+            for line_number, row in enumerate(csv.DictReader(csv_file), start=2):
+                try:
+                    price = MarketPrice(
+                        crop_id=int(row['crop_id']),
+                        location=row['location'],
+                        pincode=row['pincode'],
+                        price_per_quintal=Decimal(row['price_per_quintal']),
+                        market_name=row['market_name'],
+                        date=date.fromisoformat(row['date']),
+                        **{column: row.get(column) or None for column in OPTIONAL_TEXT_COLUMNS},
+                        **{column: _flag(row.get(column)) for column in OPTIONAL_FLAG_COLUMNS}
+                    )
+                except (KeyError, ValueError, InvalidOperation) as e:
+                    raise CommandError(f"Invalid row on line {line_number}: {e!r}")
+
+                batch.append(price)
+                if len(batch) >= batch_size:
+                    self.insert_batch(batch, crop_ids)
+                    processed += len(batch)
+                    batch = []
+
+            if batch:
+                self.insert_batch(batch, crop_ids)
+                processed += len(batch)
+
+        # bulk_create skips post_save, so drop what the MarketPrice receiver would have here
+        cache.delete_many(
+            [price_stats_cache_key(crop_id) for crop_id in crop_ids] + [caching.MARKET_TRENDS_CACHE_KEY]
+        )
+        invalidate_predictions('price_prediction')
+        caching.invalidate('crops')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {processed} market price rows for {len(crop_ids)} crops"
+        ))
+
+    def insert_batch(self, batch, crop_ids):
+        """INSERT a batch after checking its crops exist; crop_ids collects the crops seen so far"""
+        new_crop_ids = {price.crop_id for price in batch} - crop_ids
+        if new_crop_ids:
+            found = set(Crop.objects.filter(id__in=new_crop_ids).values_list('id', flat=True))
+            unknown = new_crop_ids - found
+            if unknown:
+                raise CommandError(f"Unknown crop ids: {', '.join(map(str, sorted(unknown)))}")
+            crop_ids |= found
+        MarketPrice.objects.bulk_create(batch, ignore_conflicts=True)
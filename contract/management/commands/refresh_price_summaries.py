@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from contract.ml_services import PRICE_SUMMARY_WINDOWS, refresh_market_price_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild MarketPriceSummary rows and the Crop price columns from MarketPrice history "
+        "(run nightly, e.g. from cron)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--windows', nargs='+', type=int, default=list(PRICE_SUMMARY_WINDOWS),
+            help="Window lengths in days to rebuild"
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_market_price_summaries(options['windows'])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed} market price summaries"))
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contract', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='marketprice',
+            index=models.Index(fields=['crop', '-date'], name='marketprice_crop_date_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-15 20:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contract', '0002_marketprice_crop_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarketPriceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window_days', models.PositiveSmallIntegerField(help_text='Length of the price window in days')),
+                ('avg_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('max_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('std_dev', models.FloatField(blank=True, null=True)),
+                ('sample_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('crop', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_summaries', to='contract.crop')),
+            ],
+            options={
+                'verbose_name_plural': 'Market price summaries',
+                'unique_together': {('crop', 'window_days')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-15 20:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contract', '0003_marketpricesummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['buyer', 'status'], name='contract_buyer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['farmer', 'status'], name='contract_farmer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['status', 'expected_delivery_date'], name='contract_status_delivery_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='croplisting',
+            index=models.Index(fields=['status', 'crop'], name='croplisting_status_crop_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='croplisting',
+            index=models.Index(fields=['farmer', 'status'], name='croplisting_farmer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketprice',
+            index=models.Index(fields=['pincode', 'date'], name='marketprice_pincode_date_idx'),
+        ),
+    ]
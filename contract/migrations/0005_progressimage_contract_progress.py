@@ -0,0 +1,49 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_progress_links(apps, schema_editor):
+    """Point each progress image at the (latest) progress update it was attached to"""
+    ContractProgress = apps.get_model('contract', 'ContractProgress')
+    ProgressImage = apps.get_model('contract', 'ProgressImage')
+    Through = ContractProgress.progress_images.through
+    links = Through.objects.order_by('contractprogress_id').values_list('progressimage_id', 'contractprogress_id')
+    for image_id, progress_id in links:
+        ProgressImage.objects.filter(pk=image_id).update(contract_progress_id=progress_id)
+
+
+def restore_progress_links(apps, schema_editor):
+    ContractProgress = apps.get_model('contract', 'ContractProgress')
+    ProgressImage = apps.get_model('contract', 'ProgressImage')
+    Through = ContractProgress.progress_images.through
+    Through.objects.bulk_create([
+        Through(contractprogress_id=progress_id, progressimage_id=image_id)
+        for image_id, progress_id in ProgressImage.objects.filter(
+            contract_progress__isnull=False
+        ).values_list('id', 'contract_progress_id')
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contract', '0004_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='progressimage',
+            name='contract_progress',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contract.contractprogress'),
+        ),
+        migrations.RunPython(copy_progress_links, restore_progress_links),
+        migrations.RemoveField(
+            model_name='contractprogress',
+            name='progress_images',
+        ),
+        migrations.AlterField(
+            model_name='progressimage',
+            name='contract_progress',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='progress_images', to='contract.contractprogress'),
+        ),
+    ]
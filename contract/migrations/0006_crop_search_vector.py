@@ -0,0 +1,39 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# tsvector_update_trigger keeps search_vector in sync on every INSERT/UPDATE,
+# including bulk_create() and queryset.update() which skip model signals
+CREATE_TRIGGER = """
+CREATE TRIGGER contract_crop_search_vector_update
+BEFORE INSERT OR UPDATE OF name, scientific_name, variety, search_vector ON contract_crop
+FOR EACH ROW EXECUTE FUNCTION
+tsvector_update_trigger(search_vector, 'pg_catalog.english', name, scientific_name, variety);
+
+UPDATE contract_crop SET search_vector = to_tsvector(
+    'pg_catalog.english',
+    coalesce(name, '') || ' ' || coalesce(scientific_name, '') || ' ' || coalesce(variety, '')
+);
+"""
+
+DROP_TRIGGER = "DROP TRIGGER IF EXISTS contract_crop_search_vector_update ON contract_crop;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contract', '0005_progressimage_contract_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crop',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+        migrations.AddIndex(
+            model_name='crop',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='crop_search_vector_idx'),
+        ),
+    ]
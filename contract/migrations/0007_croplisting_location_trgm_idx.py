@@ -0,0 +1,20 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contract', '0006_crop_search_vector'),
+    ]
+
+    operations = [
+        # pg_trgm provides gin_trgm_ops; left installed on reverse since other indexes may use it
+        migrations.RunSQL("CREATE EXTENSION IF NOT EXISTS pg_trgm;", migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='croplisting',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['farm_location'], name='croplisting_location_trgm_idx', opclasses=['gin_trgm_ops']
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-15 20:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contract', '0007_croplisting_location_trgm_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['created_at'], name='contract_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='croplisting',
+            index=models.Index(fields=['created_at'], name='croplisting_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='croplisting',
+            index=models.Index(fields=['farmer', 'created_at'], name='croplisting_farmer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['created_at'], name='review_created_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-15 20:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contract', '0008_created_at_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='contract',
+            name='contract_buyer_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='contract',
+            name='contract_farmer_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='croplisting',
+            name='croplisting_farmer_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['buyer', 'status', '-created_at'], name='contract_buyer_st_crt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['farmer', 'status', '-created_at'], name='contract_farmer_st_crt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='croplisting',
+            index=models.Index(fields=['farmer', 'status', '-created_at'], name='croplisting_farmer_st_crt_idx'),
+        ),
+    ]
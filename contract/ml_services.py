@@ -1,16 +1,215 @@
 # import numpy as np
 # import pandas as pd
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Min, Q, StdDev
+from django.utils import timezone
 import os
 # import joblib
-from datetime import datetime, timedelta
+from datetime import timedelta
 # import requests
 # from PIL import Image
 # import io
 # import tensorflow as tf
 # from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 # from sklearn.preprocessing import StandardScaler
+import hashlib
+import inspect
 import json
+import logging
+import zlib
+from bisect import bisect_right
+from functools import lru_cache, wraps
+
+from . import caching
+
+logger = logging.getLogger(__name__)
+
+
+# Lookup tables shared by the services below
+_SEASON_MAP = {'spring': 1, 'summer': 2, 'monsoon': 3, 'winter': 4, 'current': 2.5}
+
+_FARMING_MULTIPLIER = {
+    'organic': 0.8,
+    'traditional': 1.0,
+    'hydroponic': 1.5,
+    'mixed': 1.1
+}
+
+# Risk factors and their weights, aligned by position
+_RISK_FACTOR_ORDER = (
+    'farmer_reliability',
+    'buyer_reliability',
+    'crop_volatility',
+    'weather_risk',
+    'market_risk',
+    'quantity_risk',
+)
+_RISK_WEIGHT_VEC = (0.25, 0.20, 0.15, 0.15, 0.15, 0.10)
+
+# Crop attributes read by the services change rarely, so they are cached per crop
+CROP_CACHE_TIMEOUT = 60 * 60
+
+
+def crop_cache_keys(crop_id):
+    """Cache keys holding derived values for a crop"""
+    return [f'crop_vol_{crop_id}', f'crop_yield_{crop_id}']
+
+
+# Price window used for predictions, and the windows kept in MarketPriceSummary
+PRICE_HISTORY_DAYS = 30
+PRICE_SUMMARY_WINDOWS = (7, 30, 90)
+# Window whose average is stored as Crop.current_market_price
+CURRENT_PRICE_DAYS = 7
+
+
+def price_stats_cache_key(crop_id):
+    """Cache key holding a crop's recent price stats"""
+    return f'crop_price_stats_{crop_id}'
+
+
+# Predictions are cached in a versioned group per MLModel.model_type
+PREDICTION_CACHE_TIMEOUT = 60 * 60
+_UNCACHED_METHODS = ('default_fallback', 'error_fallback')
+
+
+def invalidate_predictions(model_type):
+    """Invalidate every cached prediction of the given model type"""
+    caching.invalidate(f'ml_prediction_{model_type}')
+
+
+def cached_prediction(model_type, key_args):
+    """
+    Cache a service method's result for PREDICTION_CACHE_TIMEOUT, keyed on the
+    arguments named in key_args; fallback results after errors are not cached
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+        
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            digest = hashlib.sha1(repr(tuple(bound.arguments[name] for name in key_args)).encode()).hexdigest()
+            key = f'ml_prediction_{model_type}_{digest}'
+            version = caching.get_version(f'ml_prediction_{model_type}')
+            
+            result = cache.get(key, version=version)
+            if result is None:
+                result = method(self, *args, **kwargs)
+                if result.get('method') not in _UNCACHED_METHODS:
+                    cache.set(key, result, PREDICTION_CACHE_TIMEOUT, version=version)
+            return result
+        return wrapper
+    return decorator
+
+
+def _price_stats_aggregates():
+    """Aggregates describing recent market prices, computed by the database"""
+    return {
+        'avg_price': Avg('price_per_quintal'),
+        'sample_count': Count('id'),
+        'std_dev': StdDev('price_per_quintal'),
+    }
+
+
+def refresh_market_price_summaries(windows=PRICE_SUMMARY_WINDOWS):
+    """
+    Rebuild MarketPriceSummary rows from the raw MarketPrice history, and the
+    crop price columns derived from them
+    """
+    from .models import Crop, MarketPrice, MarketPriceSummary
+    
+    today = timezone.localdate()
+    refreshed = 0
+    with transaction.atomic():
+        for window_days in windows:
+            rows = MarketPrice.objects.filter(
+                date__gte=today - timedelta(days=window_days)
+            ).order_by().values('crop_id').annotate(
+                min_price=Min('price_per_quintal'),
+                max_price=Max('price_per_quintal'),
+                **_price_stats_aggregates()
+            )
+            summaries = [MarketPriceSummary(window_days=window_days, **row) for row in rows]
+            MarketPriceSummary.objects.bulk_create(
+                summaries,
+                update_conflicts=True,
+                unique_fields=['crop', 'window_days'],
+                update_fields=['avg_price', 'min_price', 'max_price', 'std_dev', 'sample_count', 'updated_at']
+            )
+            # Crops with no prices left in the window lose their summary
+            MarketPriceSummary.objects.filter(window_days=window_days).exclude(
+                crop_id__in=[summary.crop_id for summary in summaries]
+            ).delete()
+            refreshed += len(summaries)
+        _refresh_crop_price_columns()
+    # Stats cached before the refresh may have come from the raw aggregate
+    crop_ids = list(Crop.objects.values_list('id', flat=True))
+    cache.delete_many([price_stats_cache_key(crop_id) for crop_id in crop_ids])
+    # The crop columns were bulk updated, which skips the Crop signals
+    cache.delete_many([key for crop_id in crop_ids for key in crop_cache_keys(crop_id)])
+    cache.delete(caching.MARKET_TRENDS_CACHE_KEY)
+    caching.invalidate('crops')
+    invalidate_predictions('price_prediction')
+    return refreshed
+
+
+def _refresh_crop_price_columns():
+    """
+    Store each crop's current price, next month prediction and volatility from its
+    price summaries, so crop reads don't aggregate MarketPrice
+    """
+    from .models import Crop, MarketPriceSummary
+    
+    # Streamed as plain rows; there are two per crop with recent prices
+    summaries = {}
+    rows = MarketPriceSummary.objects.filter(
+        window_days__in=(CURRENT_PRICE_DAYS, PRICE_HISTORY_DAYS)
+    ).values('crop_id', 'window_days', 'avg_price', 'std_dev').iterator(chunk_size=2000)
+    for row in rows:
+        summaries.setdefault(row['crop_id'], {})[row['window_days']] = row
+    
+    # bulk_update only writes the price columns, so nothing else needs loading
+    crops = Crop.objects.only('id').in_bulk(list(summaries))
+    for crop_id, windows in summaries.items():
+        crop = crops[crop_id]
+        history = windows.get(PRICE_HISTORY_DAYS)
+        current = windows.get(CURRENT_PRICE_DAYS, history)
+        crop.current_market_price = current['avg_price']
+        if history is not None:
+            # Same estimate as the historical_average price prediction
+            avg_price = history['avg_price']
+            crop.predicted_price_next_month = avg_price
+            spread = float(history['std_dev'] or 0)
+            crop.price_volatility_score = min(1.0, spread / float(avg_price)) if avg_price else 0.0
+    Crop.objects.bulk_update(
+        crops.values(),
+        ['current_market_price', 'predicted_price_next_month', 'price_volatility_score'],
+        batch_size=500
+    )
+
+
+# Quality score cut-offs; a score at or above _GRADE_THRESHOLDS[i] earns _GRADES[i + 1]
+_GRADE_THRESHOLDS = (0.6, 0.7, 0.8, 0.9)
+_GRADES = ('C', 'B', 'B+', 'A', 'A+')
+
+# Canned recommendation texts
+_QUALITY_RECS_HIGH = ("Good quality detected!", "Consider premium pricing.")
+_QUALITY_RECS_MID = ("Average quality.", "Suitable for standard markets.")
+_QUALITY_RECS_LOW = ("Manual quality assessment recommended.",)
+_MODERATE_RISK_RECS = ("Moderate risk contract - proceed with standard terms",)
+
+# Risk score cut-offs, laid out the same way as the grade table
+_RISK_THRESHOLDS = (0.3, 0.6)
+_RISK_LEVELS = ('low', 'medium', 'high')
+
+
+@lru_cache(maxsize=4096)
+def _location_feature(location):
+    """Deterministic 0..1 feature for a location name; locations repeat, so results are memoized"""
+    return (zlib.crc32(location.encode('utf-8')) & 0xFFFF) / 65535.0
 
 
 class PricePredictionService:
@@ -22,51 +221,118 @@ class PricePredictionService:
         # ML models disabled for now
         self.model = None
         self.scaler = None
-        print("ML Price Prediction Service initialized without ML models")
+        logger.debug("ML Price Prediction Service initialized without ML models")
     
     def load_model(self):
         """Load trained model and scaler - DISABLED"""
         pass
     
-    def predict_price(self, crop_id, location, quantity, season='current'):
+    @cached_prediction('price_prediction', ('crop_id', 'location', 'quantity', 'season'))
+    def predict_price(self, crop_id, location, quantity, season='current', crop=None):
         """
         Predict crop price based on various factors - FALLBACK MODE
         """
         # Always use fallback prediction without ML
-        return self._fallback_prediction(crop_id)
+        return self._fallback_prediction(crop_id, crop=crop)
     
     def _prepare_features(self, crop_id, location, quantity, season):
         """Prepare features for ML model - DISABLED"""
         return []
     
-    def _fallback_prediction(self, crop_id):
+    def predict_prices_bulk(self, crop_ids, location=None, quantity=None, season='current'):
+        """
+        Predict prices for several crops, reading recent price stats in one pass
+        """
+        from .models import Crop
+
+        crop_ids = list(crop_ids)
+        recent_stats = self._recent_price_stats(crop_ids)
+        # Crops without recent prices fall back to their base price
+        crops = Crop.objects.in_bulk([crop_id for crop_id in crop_ids if not recent_stats[crop_id]['sample_count']])
+        return {
+            crop_id: self._fallback_prediction(
+                crop_id,
+                price_stats=recent_stats[crop_id],
+                crop=crops.get(crop_id)
+            )
+            for crop_id in crop_ids
+        }
+    
+    def predict_price_batch(self, items):
+        """
+        Predict prices for a list of predict_price argument dicts, in order, reading the
+        price stats of all their crops in one pass
+        """
+        # The fallback prediction depends only on the crop, so each crop is predicted once
+        predictions = self.predict_prices_bulk({item['crop_id'] for item in items})
+        return [predictions[item['crop_id']] for item in items]
+    
+    def _recent_price_stats(self, crop_ids):
+        """
+        Recent price stats per crop, served from the cache, then MarketPriceSummary when it
+        has been built and aggregated from MarketPrice otherwise
+        """
+        from .models import MarketPrice, MarketPriceSummary
+        
+        keys = {crop_id: price_stats_cache_key(crop_id) for crop_id in crop_ids}
+        cached = cache.get_many(keys.values())
+        stats = {crop_id: cached[key] for crop_id, key in keys.items() if key in cached}
+        missing = [crop_id for crop_id in crop_ids if crop_id not in stats]
+        if not missing:
+            return stats
+        
+        fresh = {
+            row['crop_id']: row
+            for row in MarketPriceSummary.objects.filter(
+                crop_id__in=missing, window_days=PRICE_HISTORY_DAYS
+            ).values('crop_id', 'avg_price', 'sample_count', 'std_dev')
+        }
+        unsummarized = [crop_id for crop_id in missing if crop_id not in fresh]
+        if unsummarized:
+            cutoff = timezone.localdate() - timedelta(days=PRICE_HISTORY_DAYS)
+            fresh.update(
+                (row['crop_id'], row)
+                for row in MarketPrice.objects.filter(
+                    crop_id__in=unsummarized,
+                    date__gte=cutoff
+                ).order_by().values('crop_id').annotate(**_price_stats_aggregates())
+            )
+        # Crops without recent prices are cached too, so they don't hit the database every time
+        for crop_id in missing:
+            fresh.setdefault(crop_id, {'crop_id': crop_id, 'sample_count': 0})
+        cache.set_many({keys[crop_id]: row for crop_id, row in fresh.items()}, CROP_CACHE_TIMEOUT)
+        stats.update(fresh)
+        return stats
+    
+    def _fallback_prediction(self, crop_id, price_stats=None, crop=None):
         """Fallback prediction when ML model is not available"""
         try:
-            from .models import Crop, MarketPrice
+            from .models import Crop
             
-            crop = Crop.objects.get(id=crop_id)
-            recent_prices = MarketPrice.objects.filter(
-                crop=crop,
-                date__gte=datetime.now().date() - timedelta(days=30)
-            ).values_list('price_per_quintal', flat=True)
+            if price_stats is None:
+                price_stats = self._recent_price_stats([crop_id])[crop_id]
             
-            if recent_prices:
-                # Simple average calculation without numpy
-                prices_list = list(recent_prices)
-                avg_price = sum(prices_list) / len(prices_list)
+            if price_stats['sample_count']:
+                avg_price = float(price_stats['avg_price'])
+                # Fall back to a +/-15% band when there is no spread to measure
+                spread = float(price_stats['std_dev'] or 0) or avg_price * 0.15
                 return {
                     'predicted_price': round(avg_price, 2),
-                    'confidence': 0.6,
+                    'confidence': round(min(0.9, 0.3 + price_stats['sample_count'] / 50), 2),
                     'price_range': {
-                        'min': round(avg_price * 0.85, 2),
-                        'max': round(avg_price * 1.15, 2)
+                        'min': round(avg_price - spread, 2),
+                        'max': round(avg_price + spread, 2)
                     },
                     'method': 'historical_average'
                 }
             
-            base_price = crop.current_market_price or 100  # Default base price
+            if crop is None:
+                current_price = Crop.objects.values_list('current_market_price', flat=True).get(id=crop_id)
+            else:
+                current_price = getattr(crop, 'current_market_price', None)
+            base_price = float(current_price or 100)  # Default base price
             return {
-                'predicted_price': base_price,
+                'predicted_price': round(base_price, 2),
                 'confidence': 0.3,
                 'price_range': {
                     'min': round(base_price * 0.8, 2),
@@ -74,8 +340,8 @@ class PricePredictionService:
                 },
                 'method': 'base_price_estimation'
             }
-        except Exception as e:
-            print(f"Error in fallback prediction: {e}")
+        except Exception:
+            logger.exception("Fallback price prediction failed")
             return {
                 'predicted_price': 100,
                 'confidence': 0.1,
@@ -93,12 +359,11 @@ class PricePredictionService:
     
     def _season_to_numeric(self, season):
         """Convert season to numeric value"""
-        season_map = {'spring': 1, 'summer': 2, 'monsoon': 3, 'winter': 4, 'current': 2.5}
-        return season_map.get(season, 2.5)
+        return _SEASON_MAP.get(season, 2.5)
     
     def _location_to_numeric(self, location):
-        """Convert location to numeric value"""
-        return hash(location) % 100 / 100
+        """Convert location to numeric value (stable across processes, unlike hash())"""
+        return _location_feature(location)
     
     def _calculate_confidence(self, features):
         """Calculate prediction confidence - SIMPLIFIED"""
@@ -113,44 +378,51 @@ class QualityAssessmentService:
     def __init__(self):
         # ML models disabled
         self.model = None
-        print("Quality Assessment Service initialized without ML models")
+        logger.debug("Quality Assessment Service initialized without ML models")
     
     def load_model(self):
         """Load trained CNN model - DISABLED"""
         pass
     
-    def assess_quality(self, image_path):
+    def assess_quality(self, image_source):
         """
         Assess crop quality from image - FALLBACK MODE
+        
+        image_source may be a path, raw bytes or a file-like object (e.g. a storage FieldFile),
+        so images kept in remote storage don't need to be copied to local disk first
         """
         # Always use fallback assessment
         return self._fallback_assessment()
     
-    def _preprocess_image(self, image_path):
+    def assess_quality_batch(self, image_sources):
+        """
+        Assess several images in one pass - FALLBACK MODE
+        """
+        # Every image gets the same default assessment, so build it once
+        assessment = self._fallback_assessment()
+        return [assessment for _ in image_sources]
+    
+    def _preprocess_image(self, image_source):
         """Preprocess image for model input - DISABLED"""
         pass
     
+    def score_to_grade_bulk(self, scores):
+        """Convert a batch of quality scores to grades"""
+        return [_GRADES[bisect_right(_GRADE_THRESHOLDS, score)] for score in scores]
+    
     def _score_to_grade(self, score):
         """Convert quality score to grade"""
-        if score >= 0.9:
-            return 'A+'
-        elif score >= 0.8:
-            return 'A'
-        elif score >= 0.7:
-            return 'B+'
-        elif score >= 0.6:
-            return 'B'
-        else:
-            return 'C'
+        return _GRADES[bisect_right(_GRADE_THRESHOLDS, score)]
     
-    def _get_recommendations(self, score):
+    @staticmethod
+    def _get_recommendations(score):
         """Get recommendations based on quality score"""
         if score >= 0.8:
-            return ["Good quality detected!", "Consider premium pricing."]
+            return _QUALITY_RECS_HIGH
         elif score >= 0.6:
-            return ["Average quality.", "Suitable for standard markets."]
+            return _QUALITY_RECS_MID
         else:
-            return ["Manual quality assessment recommended."]
+            return _QUALITY_RECS_LOW
     
     def _fallback_assessment(self):
         """Fallback assessment when ML model is not available"""
@@ -176,25 +448,22 @@ class YieldPredictionService:
     """
     
     def __init__(self):
-        print("Yield Prediction Service initialized without ML models")
+        logger.debug("Yield Prediction Service initialized without ML models")
     
-    def predict_yield(self, crop_id, land_size, farming_type, location, images=None):
+    # Images are left out of the key: they do not affect the simplified calculation
+    @cached_prediction('yield_prediction', ('crop_id', 'land_size', 'farming_type', 'location'))
+    def predict_yield(self, crop_id, land_size, farming_type, location, images=None, crop=None):
         """
         Predict crop yield based on various factors - SIMPLIFIED CALCULATION
         """
         try:
-            from .models import Crop
-            
-            crop = Crop.objects.get(id=crop_id)
-            base_yield = crop.average_yield_per_acre or 10  # Default 10 quintals per acre
+            if crop is not None:
+                base_yield = float(crop.average_yield_per_acre or 10)  # Default 10 quintals per acre
+            else:
+                base_yield = self._get_base_yield(crop_id)
             
             # Adjust based on farming type
-            farming_multiplier = {
-                'organic': 0.8,
-                'traditional': 1.0,
-                'hydroponic': 1.5,
-                'mixed': 1.1
-            }.get(farming_type, 1.0)
+            farming_multiplier = _FARMING_MULTIPLIER.get(farming_type, 1.0)
             
             # Simple location and weather factors
             location_factor = 1.0  # Simplified
@@ -222,14 +491,38 @@ class YieldPredictionService:
                 },
                 'method': 'simplified_calculation'
             }
-        except Exception as e:
-            print(f"Error in yield prediction: {e}")
+        except Exception:
+            logger.exception("Yield prediction failed")
             return {
                 'predicted_yield': 0, 
                 'confidence': 0,
                 'method': 'error_fallback'
             }
     
+    def predict_yields_bulk(self, crop_ids, land_size, farming_type, location):
+        """
+        Predict yields for several crops, loading all Crop rows in one query
+        """
+        from .models import Crop
+        
+        crops = Crop.objects.in_bulk(crop_ids)
+        return {
+            crop_id: self.predict_yield(crop_id, land_size, farming_type, location, crop=crops.get(crop_id))
+            for crop_id in crop_ids
+        }
+    
+    def _get_base_yield(self, crop_id):
+        """Average yield per acre for a crop, cached between requests"""
+        key = f'crop_yield_{crop_id}'
+        base_yield = cache.get(key)
+        if base_yield is None:
+            from .models import Crop
+            
+            average_yield = Crop.objects.values_list('average_yield_per_acre', flat=True).get(id=crop_id)
+            base_yield = float(average_yield or 10)  # Default 10 quintals per acre
+            cache.set(key, base_yield, CROP_CACHE_TIMEOUT)
+        return base_yield
+    
     def _get_location_yield_factor(self, location):
         """Get yield factor based on location - SIMPLIFIED"""
         return 1.0
@@ -239,8 +532,13 @@ class YieldPredictionService:
         return 1.0
     
     def _assess_crop_health_from_images(self, images):
-        """Assess crop health from field images - DISABLED"""
-        return 1.0  # Default factor
+        """Assess crop health from field images with a single batched call"""
+        sources = [image.image for image in images]
+        if not sources:
+            return 1.0  # Default factor
+        
+        assessments = get_quality_service().assess_quality_batch(sources)
+        return sum(a['quality_score'] for a in assessments) / len(assessments)
 
 
 class ContractRiskAssessment:
@@ -249,36 +547,29 @@ class ContractRiskAssessment:
     """
     
     def __init__(self):
-        print("Contract Risk Assessment initialized without ML models")
+        logger.debug("Contract Risk Assessment initialized without ML models")
     
-    def assess_contract_risk(self, contract):
+    def assess_contract_risk(self, contract, farmer_stats=None, buyer_stats=None):
         """
         Assess risk factors for a contract - SIMPLIFIED LOGIC
         """
         try:
-            risk_factors = {
-                'farmer_reliability': self._assess_farmer_reliability(contract.farmer),
-                'buyer_reliability': self._assess_buyer_reliability(contract.buyer),
-                'crop_volatility': self._assess_crop_volatility(contract.listing.crop),
-                'weather_risk': 0.3,  # Fixed moderate risk
-                'market_risk': 0.4,   # Fixed moderate risk
-                'quantity_risk': self._assess_quantity_risk(contract.agreed_quantity, contract.listing.quantity_available)
-            }
+            if farmer_stats is None or buyer_stats is None:
+                farmer_stats, buyer_stats = self._get_party_stats(contract.farmer_id, contract.buyer_id)
             
-            # Calculate overall risk score
-            weights = {
-                'farmer_reliability': 0.25,
-                'buyer_reliability': 0.20,
-                'crop_volatility': 0.15,
-                'weather_risk': 0.15,
-                'market_risk': 0.15,
-                'quantity_risk': 0.10
-            }
-            
-            overall_risk = sum(
-                risk_factors[factor] * weights[factor] 
-                for factor in risk_factors
+            # Ordered as _RISK_FACTOR_ORDER
+            factors = (
+                self._assess_farmer_reliability(contract.farmer_id, farmer_stats),
+                self._assess_buyer_reliability(contract.buyer_id, buyer_stats),
+                self._assess_crop_volatility(contract.listing.crop_id),
+                0.3,  # Weather risk - fixed moderate risk
+                0.4,  # Market risk - fixed moderate risk
+                self._assess_quantity_risk(contract.agreed_quantity, contract.listing.quantity_available)
             )
+            risk_factors = dict(zip(_RISK_FACTOR_ORDER, factors))
+            
+            # Calculate overall risk score
+            overall_risk = sum(factor * weight for factor, weight in zip(factors, _RISK_WEIGHT_VEC))
             
             return {
                 'overall_risk_score': round(overall_risk, 3),
@@ -287,73 +578,139 @@ class ContractRiskAssessment:
                 'recommendations': self._get_risk_recommendations(overall_risk, risk_factors),
                 'method': 'simplified_assessment'
             }
-        except Exception as e:
-            print(f"Error in contract risk assessment: {e}")
+        except Exception:
+            logger.exception("Contract risk assessment failed")
             return {
                 'overall_risk_score': 0.5, 
                 'risk_level': 'medium',
                 'method': 'error_fallback'
             }
     
-    def _assess_farmer_reliability(self, farmer):
+    def assess_contract_risk_bulk(self, contracts):
+        """
+        Assess several contracts, fetching farmer/buyer history and crop volatility once for the whole batch
+        """
+        contracts = list(contracts)
+        farmer_stats, buyer_stats = self.get_party_stats_bulk(contracts)
+        self.warm_crop_volatility({c.listing.crop_id for c in contracts})
+        return [
+            self.assess_contract_risk(contract, farmer_stats=farmer_stats, buyer_stats=buyer_stats)
+            for contract in contracts
+        ]
+    
+    def assess_contracts_bulk(self, contract_ids):
+        """
+        Assess contracts by id; everything is read up front, so they are assessed serially
+        """
+        from .models import Contract
+        
+        contracts = list(Contract.objects.filter(id__in=contract_ids).select_related('listing'))
+        results = self.assess_contract_risk_bulk(contracts)
+        return {contract.id: result for contract, result in zip(contracts, results)}
+
+    def get_party_stats_bulk(self, contracts):
+        """
+        Farmer and buyer (completed, total) contract counts for a batch of contracts,
+        as the farmer_stats and buyer_stats arguments of assess_contract_risk
+        """
+        farmer_stats = self._get_contract_stats({c.farmer_id for c in contracts}, 'farmer_contracts')
+        buyer_stats = self._get_contract_stats({c.buyer_id for c in contracts}, 'buyer_contracts')
+        return farmer_stats, buyer_stats
+
+    def warm_crop_volatility(self, crop_ids):
+        """Cache the volatility of every crop in crop_ids not cached yet, with one query"""
+        from .models import Crop
+        
+        keys = {f'crop_vol_{crop_id}': crop_id for crop_id in crop_ids}
+        cached = cache.get_many(keys)
+        missing = {crop_id for key, crop_id in keys.items() if key not in cached}
+        if not missing:
+            return
+        volatility = dict(Crop.objects.filter(id__in=missing).values_list('id', 'price_volatility_score'))
+        cache.set_many(
+            {f'crop_vol_{crop_id}': volatility.get(crop_id) or 0.5 for crop_id in missing},
+            CROP_CACHE_TIMEOUT
+        )
+
+    def _get_contract_stats(self, user_ids, related_name):
+        """Map user id to (completed, total) contract counts using one annotated query"""
+        from django.contrib.auth import get_user_model
+
+        rows = get_user_model().objects.filter(id__in=user_ids).annotate(
+            completed=Count(related_name, filter=Q(**{f'{related_name}__status': 'completed'})),
+            total=Count(related_name)
+        ).values_list('id', 'completed', 'total')
+        return {user_id: (completed, total) for user_id, completed, total in rows}
+
+    def _get_party_stats(self, farmer_id, buyer_id):
+        """Farmer and buyer (completed, total) contract counts for a single contract in one aggregate query"""
+        from .models import Contract
+        
+        completed = Q(status='completed')
+        counts = Contract.objects.filter(Q(farmer_id=farmer_id) | Q(buyer_id=buyer_id)).aggregate(
+            farmer_completed=Count('id', filter=Q(farmer_id=farmer_id) & completed),
+            farmer_total=Count('id', filter=Q(farmer_id=farmer_id)),
+            buyer_completed=Count('id', filter=Q(buyer_id=buyer_id) & completed),
+            buyer_total=Count('id', filter=Q(buyer_id=buyer_id))
+        )
+        return (
+            {farmer_id: (counts['farmer_completed'], counts['farmer_total'])},
+            {buyer_id: (counts['buyer_completed'], counts['buyer_total'])}
+        )
+
+    def _assess_farmer_reliability(self, farmer_id, stats):
         """Assess farmer reliability based on history"""
-        try:
-            completed_contracts = farmer.farmer_contracts.filter(status='completed').count()
-            total_contracts = farmer.farmer_contracts.count()
-            
-            if total_contracts == 0:
-                return 0.5  # Neutral for new farmers
-            
-            completion_rate = completed_contracts / total_contracts
-            
-            # Simple reliability calculation without complex ML
-            reliability_score = completion_rate * 0.8 + 0.2  # Give some benefit of doubt
-            return 1 - reliability_score  # Convert to risk score
-        except Exception as e:
-            print(f"Error assessing farmer reliability: {e}")
-            return 0.5
+        completed_contracts, total_contracts = stats.get(farmer_id, (0, 0))
+        
+        if total_contracts == 0:
+            return 0.5  # Neutral for new farmers
+        
+        completion_rate = completed_contracts / total_contracts
+        
+        # Simple reliability calculation without complex ML
+        reliability_score = completion_rate * 0.8 + 0.2  # Give some benefit of doubt
+        return 1 - reliability_score  # Convert to risk score
     
-    def _assess_buyer_reliability(self, buyer):
+    def _assess_buyer_reliability(self, buyer_id, stats):
         """Assess buyer reliability"""
-        try:
-            completed_contracts = buyer.buyer_contracts.filter(status='completed').count()
-            total_contracts = buyer.buyer_contracts.count()
-            
-            if total_contracts == 0:
-                return 0.5
-            
-            completion_rate = completed_contracts / total_contracts
-            return 1 - (completion_rate * 0.8 + 0.2)
-        except Exception as e:
-            print(f"Error assessing buyer reliability: {e}")
+        completed_contracts, total_contracts = stats.get(buyer_id, (0, 0))
+        
+        if total_contracts == 0:
             return 0.5
+        
+        completion_rate = completed_contracts / total_contracts
+        return 1 - (completion_rate * 0.8 + 0.2)
     
-    def _assess_crop_volatility(self, crop):
+    def _assess_crop_volatility(self, crop_id):
         """Assess crop price volatility"""
-        return crop.price_volatility_score or 0.5
+        key = f'crop_vol_{crop_id}'
+        volatility = cache.get(key)
+        if volatility is None:
+            from .models import Crop
+            
+            volatility = Crop.objects.filter(id=crop_id).values_list(
+                'price_volatility_score', flat=True
+            ).first() or 0.5
+            cache.set(key, volatility, CROP_CACHE_TIMEOUT)
+        return volatility
     
     def _assess_quantity_risk(self, contracted_quantity, available_quantity):
         """Assess risk related to quantity commitments"""
-        try:
-            if available_quantity == 0:
-                return 1.0
-            
-            ratio = contracted_quantity / available_quantity
-            if ratio > 1:
-                return min(ratio - 1, 1.0)  # Over-commitment risk
-            return 0.1  # Low risk
-        except Exception as e:
-            print(f"Error assessing quantity risk: {e}")
-            return 0.5
+        if available_quantity <= 0:
+            return 1.0
+        
+        ratio = float(contracted_quantity) / float(available_quantity)
+        if ratio > 1:
+            return min(ratio - 1, 1.0)  # Over-commitment risk
+        return 0.1  # Low risk
+    
+    def categorize_risk_bulk(self, risk_scores):
+        """Categorize a batch of risk scores"""
+        return [_RISK_LEVELS[bisect_right(_RISK_THRESHOLDS, score)] for score in risk_scores]
     
     def _categorize_risk(self, risk_score):
         """Categorize risk score"""
-        if risk_score < 0.3:
-            return 'low'
-        elif risk_score < 0.6:
-            return 'medium'
-        else:
-            return 'high'
+        return _RISK_LEVELS[bisect_right(_RISK_THRESHOLDS, risk_score)]
     
     def _get_risk_recommendations(self, overall_risk, risk_factors):
         """Get recommendations based on risk assessment"""
@@ -368,14 +725,25 @@ class ContractRiskAssessment:
         if risk_factors.get('quantity_risk', 0) > 0.5:
             recommendations.append("High quantity commitment - ensure adequate supply")
         
-        if not recommendations:
-            recommendations.append("Moderate risk contract - proceed with standard terms")
-        
-        return recommendations
+        return recommendations or _MODERATE_RISK_RECS
+
+
+# Services are built on first use rather than at import time
+@lru_cache(maxsize=1)
+def get_price_service():
+    return PricePredictionService()
+
+
+@lru_cache(maxsize=1)
+def get_quality_service():
+    return QualityAssessmentService()
+
+
+@lru_cache(maxsize=1)
+def get_yield_service():
+    return YieldPredictionService()
 
 
-# Initialize services (without heavy ML dependencies)
-price_service = PricePredictionService()
-quality_service = QualityAssessmentService()
-yield_service = YieldPredictionService()
-risk_service = ContractRiskAssessment()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_risk_service():
+    return ContractRiskAssessment()
@@ -1,6 +1,8 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from decimal import Decimal
 import uuid
 
@@ -48,11 +50,17 @@ class Crop(models.Model):
     soil_ph_min = models.FloatField(blank=True, null=True)
     soil_ph_max = models.FloatField(blank=True, null=True)
     
+    # Full-text search over name, scientific_name and variety, kept up to date by a database trigger
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ['name', 'variety']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='crop_search_vector_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.variety})" if self.variety else self.name
@@ -118,6 +126,18 @@ class CropListing(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'crop'], name='croplisting_status_crop_idx'),
+            # Serves both the WHERE and the ORDER BY of status-filtered my_listings pages
+            models.Index(fields=['farmer', 'status', '-created_at'], name='croplisting_farmer_st_crt_idx'),
+            # Keyset pagination, overall and for my_listings
+            models.Index(fields=['created_at'], name='croplisting_created_idx'),
+            models.Index(fields=['farmer', 'created_at'], name='croplisting_farmer_created_idx'),
+            # Trigram index so farm_location icontains filters don't scan the table
+            GinIndex(fields=['farm_location'], name='croplisting_location_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
+
     def __str__(self):
         return f"{self.crop.name} - {self.farmer.username} ({self.quantity_available} quintals)"
 
@@ -204,6 +224,14 @@ class Contract(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['buyer', 'status', '-created_at'], name='contract_buyer_st_crt_idx'),
+            models.Index(fields=['farmer', 'status', '-created_at'], name='contract_farmer_st_crt_idx'),
+            models.Index(fields=['status', 'expected_delivery_date'], name='contract_status_delivery_idx'),
+            models.Index(fields=['created_at'], name='contract_created_idx'),
+        ]
+
     def __str__(self):
         return f"Contract {self.contract_id} - {self.listing.crop.name}"
 
@@ -226,9 +254,6 @@ class ContractProgress(models.Model):
     progress_percentage = models.FloatField(validators=[MinValueValidator(0), MaxValueValidator(100)])
     notes = models.TextField(blank=True, null=True)
     
-    # Images for ML analysis
-    progress_images = models.ManyToManyField('ProgressImage', blank=True)
-    
     # ML predictions
     predicted_completion_date = models.DateField(blank=True, null=True)
     quality_trend = models.CharField(max_length=20, blank=True, null=True)  # improving/stable/declining
@@ -246,6 +271,9 @@ class ProgressImage(models.Model):
     """
     Images showing crop/contract progress
     """
+    contract_progress = models.ForeignKey(
+        ContractProgress, on_delete=models.CASCADE, related_name='progress_images', blank=True, null=True
+    )
     image = models.ImageField(upload_to='progress_images/')
     caption = models.CharField(max_length=255, blank=True, null=True)
     
@@ -282,6 +310,11 @@ class Review(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='review_created_idx'),
+        ]
+
     def __str__(self):
         return f"Review by {self.reviewer.username} for {self.reviewee.username}"
 
@@ -312,11 +345,39 @@ class MarketPrice(models.Model):
 
     class Meta:
         unique_together = ['crop', 'location', 'date', 'market_name']
+        indexes = [
+            models.Index(fields=['crop', '-date'], name='marketprice_crop_date_idx'),
+            models.Index(fields=['pincode', 'date'], name='marketprice_pincode_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.crop.name} - ₹{self.price_per_quintal}/quintal ({self.date})"
 
 
+class MarketPriceSummary(models.Model):
+    """
+    Rolled-up market price statistics per crop, rebuilt by the refresh_price_summaries command
+    """
+    crop = models.ForeignKey(Crop, on_delete=models.CASCADE, related_name='price_summaries')
+    window_days = models.PositiveSmallIntegerField(help_text="Length of the price window in days")
+    
+    # Aggregates over the window
+    avg_price = models.DecimalField(max_digits=10, decimal_places=2)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2)
+    std_dev = models.FloatField(blank=True, null=True)
+    sample_count = models.PositiveIntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['crop', 'window_days']
+        verbose_name_plural = "Market price summaries"
+
+    def __str__(self):
+        return f"{self.crop.name} - {self.window_days} day avg ₹{self.avg_price}/quintal"
+
+
 class MLModel(models.Model):
     """
     Track ML models and their performance
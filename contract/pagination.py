@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination on created_at, newest first; deep pages cost the same as
+    the first one, unlike LIMIT/OFFSET
+    """
+    ordering = '-created_at'
@@ -1,3 +1,5 @@
+import copy
+
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import (
@@ -7,7 +9,7 @@ from .models import (
 
 # Try to import ML services, but handle failure gracefully
 try:
-    from .ml_services import price_service, quality_service, yield_service, risk_service
+    from .ml_services import get_price_service, get_quality_service, get_yield_service, get_risk_service
     ML_SERVICES_AVAILABLE = True
 except ImportError:
     ML_SERVICES_AVAILABLE = False
@@ -22,15 +24,72 @@ except ImportError:
         def assess_contract_risk(self, *args, **kwargs):
             return {'overall_risk_score': 0.5, 'risk_level': 'unknown', 'method': 'unavailable'}
     
-    price_service = DummyMLService()
-    quality_service = DummyMLService()
-    yield_service = DummyMLService()
-    risk_service = DummyMLService()
+    dummy_ml_service = DummyMLService()
+
+    def get_price_service():
+        return dummy_ml_service
+
+    get_quality_service = get_yield_service = get_risk_service = get_price_service
 
 User = get_user_model()
 
+# ModelSerializer fields built per serializer class, see CachedFieldsMixin
+_fields_cache = {}
+
+
+class FullNameField(serializers.ReadOnlyField):
+    """
+    Full name of a related user, read from a `<relation>_full_name` queryset
+    annotation when the view provides one
+    """
+    def __init__(self, relation, **kwargs):
+        self.relation = relation
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+
+    def to_representation(self, obj):
+        full_name = getattr(obj, f'{self.relation}_full_name', None)
+        if full_name is None:
+            full_name = getattr(obj, self.relation).get_full_name()
+        return full_name
+
+
+def requested_fields(request):
+    """Field names picked with ?fields=a,b on a GET request, or None for all fields"""
+    if request is None or request.method != 'GET':
+        return None
+    fields = request.query_params.get('fields')
+    if not fields:
+        return None
+    return {name.strip() for name in fields.split(',') if name.strip()}
+
+
+class DynamicFieldsMixin:
+    """
+    Drop the fields a GET request did not ask for with ?fields=, so expensive
+    method fields such as ML predictions are never evaluated
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = requested_fields(self.context.get('request'))
+        if requested is not None:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's fields from the model once per class and hand
+    each serializer instance its own copies
+    """
+    def get_fields(self):
+        fields = _fields_cache.get(self.__class__)
+        if fields is None:
+            fields = _fields_cache[self.__class__] = super().get_fields()
+        return copy.deepcopy(fields)
+
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for crop categories
     """
@@ -41,10 +100,12 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def get_crops_count(self, obj):
-        return obj.crops.count()
+        # Annotated by CategoryViewSet; count directly for other querysets
+        count = getattr(obj, 'num_crops', None)
+        return obj.crops.count() if count is None else count
 
 
-class CropSerializer(serializers.ModelSerializer):
+class CropSerializer(DynamicFieldsMixin, CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for crops with ML predictions
     """
@@ -54,18 +115,24 @@ class CropSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Crop
-        fields = '__all__'
+        exclude = ('search_vector',)
 
     def get_active_listings_count(self, obj):
-        return obj.listings.filter(status='active').count()
+        count = getattr(obj, 'num_active_listings', None)
+        return obj.listings.filter(status='active').count() if count is None else count
 
     def get_price_prediction(self, obj):
         """Get ML price prediction for the crop"""
         if not ML_SERVICES_AVAILABLE:
             return {'error': 'ML services unavailable', 'predicted_price': obj.current_market_price or 0}
         
+        # List views predict the whole page up front
+        predictions = self.context.get('price_predictions')
+        if predictions is not None and obj.id in predictions:
+            return predictions[obj.id]
+        
         try:
-            prediction = price_service.predict_price(
+            prediction = get_price_service().predict_price(
                 crop_id=obj.id,
                 location="Default",
                 quantity=100,
@@ -86,44 +153,52 @@ class CropImageSerializer(serializers.ModelSerializer):
         read_only_fields = ('ai_quality_assessment', 'predicted_yield', 'health_score', 'ripeness_score')
 
     def create(self, validated_data):
+        if not ML_SERVICES_AVAILABLE:
+            # Set default values when ML is not available, as part of the insert
+            validated_data['ai_quality_assessment'] = {'note': 'ML analysis unavailable'}
+            validated_data['health_score'] = 0.7  # Default score
+            validated_data['ripeness_score'] = 0.7  # Default score
+            return super().create(validated_data)
+        
         image = super().create(validated_data)
         
-        # Trigger ML analysis for the uploaded image only if ML is available
-        if ML_SERVICES_AVAILABLE:
-            try:
-                quality_assessment = quality_service.assess_quality(image.image.path)
-                image.ai_quality_assessment = quality_assessment
-                image.health_score = quality_assessment.get('quality_score')
-                image.ripeness_score = quality_assessment.get('ripeness_score')
-                image.save()
-            except Exception as e:
-                print(f"Error in ML analysis: {e}")
-        else:
-            # Set default values when ML is not available
-            image.ai_quality_assessment = {'note': 'ML analysis unavailable'}
-            image.health_score = 0.7  # Default score
-            image.ripeness_score = 0.7  # Default score
-            image.save()
+        # ML analysis needs the stored file, so the results are written back afterwards
+        try:
+            quality_assessment = get_quality_service().assess_quality(image.image)
+            image.ai_quality_assessment = quality_assessment
+            image.health_score = quality_assessment.get('quality_score')
+            image.ripeness_score = quality_assessment.get('ripeness_score')
+            image.save(update_fields=['ai_quality_assessment', 'health_score', 'ripeness_score'])
+        except Exception as e:
+            print(f"Error in ML analysis: {e}")
         
         return image
 
 
-class CropListingSerializer(serializers.ModelSerializer):
+class CropListingSerializer(DynamicFieldsMixin, CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for crop listings with ML enhancements
     """
-    farmer_name = serializers.CharField(source='farmer.get_full_name', read_only=True)
+    farmer_name = FullNameField('farmer')
     farmer_username = serializers.CharField(source='farmer.username', read_only=True)
     crop_name = serializers.CharField(source='crop.name', read_only=True)
     crop_category = serializers.CharField(source='crop.category.name', read_only=True)
     images = CropImageSerializer(many=True, read_only=True)
-    total_value = serializers.ReadOnlyField()
+    total_value = serializers.SerializerMethodField()
     ml_predictions = serializers.SerializerMethodField()
     contracts_count = serializers.SerializerMethodField()
 
     class Meta:
         model = CropListing
-        fields = '__all__'
+        fields = (
+            'id', 'farmer_name', 'farmer_username', 'crop_name', 'crop_category', 'images',
+            'total_value', 'ml_predictions', 'contracts_count', 'listing_id',
+            'quantity_available', 'expected_price_per_quintal', 'quality_grade', 'organic_certified',
+            'expected_harvest_date', 'is_harvested', 'actual_harvest_date',
+            'farm_location', 'pincode', 'latitude', 'longitude', 'status',
+            'ai_quality_score', 'ai_price_recommendation', 'market_demand_score',
+            'description', 'terms_and_conditions', 'created_at', 'updated_at', 'farmer', 'crop'
+        )
         read_only_fields = ('listing_id', 'farmer', 'ai_quality_score', 'ai_price_recommendation', 'market_demand_score')
 
     def get_ml_predictions(self, obj):
@@ -132,19 +207,23 @@ class CropListingSerializer(serializers.ModelSerializer):
             return {'note': 'ML predictions unavailable'}
         
         try:
-            # Price prediction
-            price_pred = price_service.predict_price(
-                crop_id=obj.crop.id,
-                location=obj.farm_location,
-                quantity=float(obj.quantity_available),
-                season="current"
-            )
+            # Price prediction, batched for the page by list views
+            predictions = self.context.get('price_predictions')
+            if predictions is not None and obj.crop_id in predictions:
+                price_pred = predictions[obj.crop_id]
+            else:
+                price_pred = get_price_service().predict_price(
+                    crop_id=obj.crop_id,
+                    location=obj.farm_location,
+                    quantity=float(obj.quantity_available),
+                    season="current"
+                )
             
             # Yield prediction if farmer profile exists
             yield_pred = None
             if hasattr(obj.farmer, 'farmer_profile'):
                 farmer_profile = obj.farmer.farmer_profile
-                yield_pred = yield_service.predict_yield(
+                yield_pred = get_yield_service().predict_yield(
                     crop_id=obj.crop.id,
                     land_size=float(farmer_profile.land_size or 1),
                     farming_type=farmer_profile.farming_type or 'traditional',
@@ -160,38 +239,81 @@ class CropListingSerializer(serializers.ModelSerializer):
         except Exception as e:
             return {'error': str(e), 'ml_available': False}
 
+    def get_total_value(self, obj):
+        # Computed by the database in CropListingViewSet
+        value = getattr(obj, 'annotated_total_value', None)
+        return obj.total_value if value is None else value
+
     def get_contracts_count(self, obj):
-        return obj.contracts.count()
+        count = getattr(obj, 'num_contracts', None)
+        return obj.contracts.count() if count is None else count
 
     def create(self, validated_data):
         # Set farmer from request user
         validated_data['farmer'] = self.context['request'].user
-        listing = super().create(validated_data)
         
-        # Generate ML recommendations only if available
+        # Generate ML recommendations only if available; they are stored with the insert
         if ML_SERVICES_AVAILABLE:
             try:
-                price_pred = price_service.predict_price(
-                    crop_id=listing.crop.id,
-                    location=listing.farm_location,
-                    quantity=float(listing.quantity_available)
+                price_pred = get_price_service().predict_price(
+                    crop_id=validated_data['crop'].id,
+                    location=validated_data['farm_location'],
+                    quantity=float(validated_data['quantity_available'])
                 )
-                listing.ai_price_recommendation = price_pred.get('predicted_price')
-                listing.save()
+                validated_data['ai_price_recommendation'] = price_pred.get('predicted_price')
             except Exception as e:
                 print(f"Error generating ML recommendations: {e}")
         
-        return listing
+        return super().create(validated_data)
+
 
+# Long free-text listing columns, left out of (and deferred for) list pages
+LISTING_TEXT_FIELDS = ('description', 'terms_and_conditions')
 
-class ContractSerializer(serializers.ModelSerializer):
+
+class CropListingListSerializer(CropListingSerializer):
+    """
+    Listing serializer for list pages, without the long free-text fields
+    """
+    class Meta(CropListingSerializer.Meta):
+        fields = tuple(name for name in CropListingSerializer.Meta.fields if name not in LISTING_TEXT_FIELDS)
+
+
+# Columns CropListingListSerializer reads from a listing and its select_related rows,
+# for QuerySet.only(); everything else (long texts, password hashes, profile texts) stays unloaded
+LISTING_LIST_COLUMNS = (
+    'listing_id', 'farmer', 'crop', 'quantity_available', 'expected_price_per_quintal',
+    'quality_grade', 'organic_certified', 'expected_harvest_date', 'is_harvested', 'actual_harvest_date',
+    'farm_location', 'pincode', 'latitude', 'longitude', 'status',
+    'ai_quality_score', 'ai_price_recommendation', 'market_demand_score', 'created_at', 'updated_at',
+    'farmer__username', 'farmer__farmer_profile__land_size', 'farmer__farmer_profile__farming_type',
+    'crop__name', 'crop__category__name',
+)
+
+
+# Number of progress updates embedded in a contract
+RECENT_PROGRESS_UPDATES = 3
+
+
+class ListingSummarySerializer(serializers.ModelSerializer):
+    """
+    Compact listing representation embedded in contracts
+    """
+    crop_name = serializers.CharField(source='crop.name', read_only=True)
+
+    class Meta:
+        model = CropListing
+        fields = ('id', 'listing_id', 'crop_name', 'quantity_available', 'expected_price_per_quintal')
+
+
+class ContractSerializer(DynamicFieldsMixin, CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for contracts with ML risk assessment
     """
-    farmer_name = serializers.CharField(source='farmer.get_full_name', read_only=True)
-    buyer_name = serializers.CharField(source='buyer.get_full_name', read_only=True)
+    farmer_name = FullNameField('farmer')
+    buyer_name = FullNameField('buyer')
     crop_name = serializers.CharField(source='listing.crop.name', read_only=True)
-    listing_details = CropListingSerializer(source='listing', read_only=True)
+    listing_details = ListingSummarySerializer(source='listing', read_only=True)
     days_until_delivery = serializers.ReadOnlyField()
     risk_assessment = serializers.SerializerMethodField()
     progress_updates = serializers.SerializerMethodField()
@@ -206,14 +328,21 @@ class ContractSerializer(serializers.ModelSerializer):
         if not ML_SERVICES_AVAILABLE:
             return {'note': 'Risk assessment unavailable', 'risk_level': 'unknown'}
         
+        # List views fetch the party history of the whole page up front
+        farmer_stats, buyer_stats = self.context.get('party_stats', (None, None))
         try:
-            return risk_service.assess_contract_risk(obj)
+            return get_risk_service().assess_contract_risk(
+                obj, farmer_stats=farmer_stats, buyer_stats=buyer_stats
+            )
         except Exception as e:
             return {'error': str(e), 'risk_level': 'unknown'}
 
     def get_progress_updates(self, obj):
         """Get recent progress updates"""
-        recent_updates = obj.progress_updates.all()[:3]
+        # Prefetched by ContractViewSet
+        recent_updates = getattr(obj, 'recent_progress', None)
+        if recent_updates is None:
+            recent_updates = obj.progress_updates.all()[:RECENT_PROGRESS_UPDATES]
         return ContractProgressSerializer(recent_updates, many=True).data
 
     def create(self, validated_data):
@@ -230,9 +359,9 @@ class ContractSerializer(serializers.ModelSerializer):
         # Generate ML risk assessment only if available
         if ML_SERVICES_AVAILABLE:
             try:
-                risk_assessment = risk_service.assess_contract_risk(contract)
+                risk_assessment = get_risk_service().assess_contract_risk(contract)
                 contract.ai_risk_score = risk_assessment.get('overall_risk_score')
-                contract.save()
+                contract.save(update_fields=['ai_risk_score'])
             except Exception as e:
                 print(f"Error generating risk assessment: {e}")
         
@@ -249,22 +378,22 @@ class ProgressImageSerializer(serializers.ModelSerializer):
         read_only_fields = ('growth_stage', 'health_assessment', 'estimated_yield')
 
     def create(self, validated_data):
+        if not ML_SERVICES_AVAILABLE:
+            # Set default values as part of the insert
+            validated_data['health_assessment'] = {'note': 'ML analysis unavailable'}
+            validated_data['growth_stage'] = 'Unknown'
+            return super().create(validated_data)
+        
         image = super().create(validated_data)
         
-        # Trigger ML analysis only if available
-        if ML_SERVICES_AVAILABLE:
-            try:
-                quality_assessment = quality_service.assess_quality(image.image.path)
-                image.health_assessment = quality_assessment
-                image.growth_stage = quality_assessment.get('quality_grade', 'Unknown')
-                image.save()
-            except Exception as e:
-                print(f"Error in progress image ML analysis: {e}")
-        else:
-            # Set default values
-            image.health_assessment = {'note': 'ML analysis unavailable'}
-            image.growth_stage = 'Unknown'
-            image.save()
+        # ML analysis needs the stored file, so the results are written back afterwards
+        try:
+            quality_assessment = get_quality_service().assess_quality(image.image)
+            image.health_assessment = quality_assessment
+            image.growth_stage = quality_assessment.get('quality_grade', 'Unknown')
+            image.save(update_fields=['health_assessment', 'growth_stage'])
+        except Exception as e:
+            print(f"Error in progress image ML analysis: {e}")
         
         return image
 
@@ -279,7 +408,8 @@ class ContractProgressSerializer(serializers.ModelSerializer):
     class Meta:
         model = ContractProgress
         fields = '__all__'
-        read_only_fields = ('predicted_completion_date', 'quality_trend')
+        # contract and updated_by are supplied by ContractViewSet.update_progress
+        read_only_fields = ('contract', 'updated_by', 'predicted_completion_date', 'quality_trend')
 
     def create(self, validated_data):
         validated_data['updated_by'] = self.context['request'].user
@@ -288,7 +418,7 @@ class ContractProgressSerializer(serializers.ModelSerializer):
         # Update contract completion percentage
         contract = progress.contract
         contract.completion_percentage = progress.progress_percentage
-        contract.save()
+        contract.save(update_fields=['completion_percentage', 'updated_at'])
         
         return progress
 
@@ -297,14 +427,14 @@ class ReviewSerializer(serializers.ModelSerializer):
     """
     Serializer for reviews and ratings
     """
-    reviewer_name = serializers.CharField(source='reviewer.get_full_name', read_only=True)
-    reviewee_name = serializers.CharField(source='reviewee.get_full_name', read_only=True)
+    reviewer_name = FullNameField('reviewer')
+    reviewee_name = FullNameField('reviewee')
     contract_details = serializers.SerializerMethodField()
 
     class Meta:
         model = Review
         fields = '__all__'
-        read_only_fields = ('reviewer', 'sentiment_score')
+        read_only_fields = ('reviewer', 'reviewee', 'sentiment_score')
 
     def get_contract_details(self, obj):
         return {
@@ -316,21 +446,18 @@ class ReviewSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data['reviewer'] = self.context['request'].user
         
-        # Determine reviewee based on reviewer
+        # Determine reviewee based on reviewer; ids only, so no party rows are loaded
         contract = validated_data['contract']
-        if self.context['request'].user == contract.farmer:
-            validated_data['reviewee'] = contract.buyer
+        if contract.farmer_id == self.context['request'].user.id:
+            validated_data['reviewee_id'] = contract.buyer_id
         else:
-            validated_data['reviewee'] = contract.farmer
-        
-        review = super().create(validated_data)
+            validated_data['reviewee_id'] = contract.farmer_id
         
         # Sentiment analysis would go here if ML was available
-        # For now, set a neutral score
-        review.sentiment_score = 0.0
-        review.save()
+        # For now, set a neutral score as part of the insert
+        validated_data['sentiment_score'] = 0.0
         
-        return review
+        return super().create(validated_data)
 
 
 class MarketPriceSerializer(serializers.ModelSerializer):
@@ -377,6 +504,13 @@ class PricePredictionSerializer(serializers.Serializer):
     season = serializers.CharField(max_length=20, default='current')
 
 
+class PriceBatchPredictionSerializer(serializers.Serializer):
+    """
+    Serializer for batched price prediction requests
+    """
+    items = PricePredictionSerializer(many=True, allow_empty=False, max_length=100)
+
+
 class QualityAssessmentSerializer(serializers.Serializer):
     """
     Serializer for quality assessment requests
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import caching
+from .ml_services import crop_cache_keys, invalidate_predictions, price_stats_cache_key
+from .models import Category, Contract, Crop, CropListing, MarketPrice, MLModel
+
+
+@receiver([post_save, post_delete], sender=Crop)
+def invalidate_crop_cache(sender, instance, **kwargs):
+    """Drop cached crop values used by the ML services"""
+    cache.delete_many(crop_cache_keys(instance.pk))
+    invalidate_predictions('price_prediction')
+    invalidate_predictions('yield_prediction')
+    caching.invalidate('crops')
+    caching.invalidate('categories')
+    cache.delete(caching.MARKET_TRENDS_CACHE_KEY)
+
+
+@receiver([post_save, post_delete], sender=MarketPrice)
+def invalidate_price_stats_cache(sender, instance, **kwargs):
+    """Drop the cached price stats for the crop a market price belongs to"""
+    cache.delete(price_stats_cache_key(instance.crop_id))
+    invalidate_predictions('price_prediction')
+    caching.invalidate('crops')
+    cache.delete(caching.MARKET_TRENDS_CACHE_KEY)
+
+
+@receiver([post_save, post_delete], sender=MLModel)
+def invalidate_model_predictions(sender, instance, **kwargs):
+    """A new or retrained model makes cached predictions of its type stale"""
+    invalidate_predictions(instance.model_type)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_lists(sender, instance, **kwargs):
+    """Category names and counts appear in the cached category and crop lists"""
+    caching.invalidate('categories')
+    caching.invalidate('crops')
+    cache.delete(caching.MARKET_TRENDS_CACHE_KEY)
+
+
+@receiver([post_save, post_delete], sender=CropListing)
+def invalidate_listing_caches(sender, instance, **kwargs):
+    """Crop lists and market trends show listing counts; the farmer's dashboard shows their listings"""
+    caching.invalidate('crops')
+    cache.delete_many([caching.MARKET_TRENDS_CACHE_KEY, caching.dashboard_cache_key(instance.farmer_id)])
+
+
+@receiver([post_save, post_delete], sender=Contract)
+def invalidate_contract_dashboards(sender, instance, **kwargs):
+    """Drop the cached dashboards of both contract parties and the market contract summary"""
+    caching.invalidate_contract(instance.farmer_id, instance.buyer_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_user_dashboard(sender, instance, **kwargs):
+    """The dashboard layout depends on the user type"""
+    cache.delete(caching.dashboard_cache_key(instance.pk))
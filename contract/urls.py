@@ -20,6 +20,7 @@ urlpatterns = [
     
     # ML endpoints
     path('ml/predict-price/', views.predict_price, name='predict-price'),
+    path('ml/predict-price-batch/', views.predict_price_batch, name='predict-price-batch'),
     path('ml/assess-quality/', views.assess_quality, name='assess-quality'),
     path('ml/predict-yield/', views.predict_yield, name='predict-yield'),
 ]
\ No newline at end of file
@@ -2,26 +2,33 @@ from rest_framework import generics, status, permissions, viewsets
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from django.shortcuts import get_object_or_404
-from django.db.models import Q, Count, Sum, Avg
+from django.contrib.postgres.search import SearchQuery
+from django.core.cache import cache
+from django.db.models import Q, F, Count, Sum, Avg, Prefetch, Value, CharField
+from django.db.models.functions import Concat, Trim
 from django.utils import timezone
 from datetime import timedelta
+import hashlib
+import re
 
+from . import caching
+from .pagination import CreatedAtCursorPagination
 from .models import (
     Category, Crop, CropListing, CropImage, Contract, 
     ContractProgress, ProgressImage, Review, MarketPrice, MLModel
 )
 from .serializers import (
-    CategorySerializer, CropSerializer, CropListingSerializer, CropImageSerializer,
+    LISTING_LIST_COLUMNS, RECENT_PROGRESS_UPDATES, requested_fields,
+    CategorySerializer, CropSerializer, CropListingSerializer, CropListingListSerializer, CropImageSerializer,
     ContractSerializer, ContractProgressSerializer, ProgressImageSerializer,
     ReviewSerializer, MarketPriceSerializer, MLModelSerializer,
-    DashboardSerializer, PricePredictionSerializer, QualityAssessmentSerializer,
+    DashboardSerializer, PricePredictionSerializer, PriceBatchPredictionSerializer, QualityAssessmentSerializer,
     YieldPredictionSerializer
 )
 
 # Import ML services (now simplified without heavy dependencies)
 try:
-    from .ml_services import price_service, quality_service, yield_service, risk_service
+    from .ml_services import get_price_service, get_quality_service, get_yield_service, get_risk_service
     ML_SERVICES_AVAILABLE = True
 except ImportError as e:
     print(f"ML services not available: {e}")
@@ -30,26 +37,110 @@ except ImportError as e:
     class DummyService:
         def predict_price(self, *args, **kwargs):
             return {'predicted_price': 100, 'confidence': 0.1, 'method': 'unavailable'}
+        def predict_prices_bulk(self, crop_ids, *args, **kwargs):
+            return {crop_id: self.predict_price() for crop_id in crop_ids}
+        def predict_price_batch(self, items):
+            return [self.predict_price() for item in items]
         def assess_quality(self, *args, **kwargs):
             return {'quality_score': 0.5, 'method': 'unavailable'}
         def predict_yield(self, *args, **kwargs):
             return {'predicted_yield': 10, 'confidence': 0.1, 'method': 'unavailable'}
         def assess_contract_risk(self, *args, **kwargs):
             return {'overall_risk_score': 0.5, 'risk_level': 'unknown', 'method': 'unavailable'}
+        def get_party_stats_bulk(self, contracts):
+            return {}, {}
+        def warm_crop_volatility(self, crop_ids):
+            pass
     
-    price_service = DummyService()
-    quality_service = DummyService()
-    yield_service = DummyService()
-    risk_service = DummyService()
+    dummy_service = DummyService()
 
+    def get_price_service():
+        return dummy_service
 
-class CategoryViewSet(viewsets.ModelViewSet):
+    get_quality_service = get_yield_service = get_risk_service = get_price_service
+
+
+# Resolved once at import; the dummy shares the real services' interface, so views
+# call these without checking ML_SERVICES_AVAILABLE
+price_service = get_price_service()
+quality_service = get_quality_service()
+yield_service = get_yield_service()
+risk_service = get_risk_service()
+
+
+def full_name(relation):
+    """SQL equivalent of User.get_full_name() for a user relation, for FullNameField"""
+    return Trim(Concat(
+        f'{relation}__first_name', Value(' '), f'{relation}__last_name',
+        output_field=CharField()
+    ))
+
+
+def prefix_search_query(text):
+    """
+    Full-text query matching every word of text as a prefix, so partial input
+    like 'whe' still finds 'wheat' the way the old icontains filters did
+    """
+    words = re.findall(r'[^\W_]+', text)
+    if not words:
+        return None
+    return SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config='english')
+
+
+class CachedListMixin:
+    """
+    Cache list responses per URL in the versioned cache group list_cache_group,
+    which signals invalidate when the underlying rows change
+    """
+    list_cache_group = None
+    list_cache_timeout = 300
+
+    def list(self, request, *args, **kwargs):
+        url = request.build_absolute_uri()
+        key = f'list_{self.list_cache_group}_{hashlib.sha1(url.encode()).hexdigest()}'
+        version = caching.get_version(self.list_cache_group)
+        data = cache.get(key, version=version)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, self.list_cache_timeout, version=version)
+        return Response(data)
+
+
+class BatchedPricePredictionMixin:
+    """
+    Predict prices for a whole page with one service call and hand the results
+    to the serializer as context['price_predictions'], keyed by crop id
+    """
+    price_prediction_crop_field = 'crop_id'
+    # Serializer field that shows the predictions; skipped when ?fields= leaves it out
+    price_prediction_field = 'ml_predictions'
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        objects = list(queryset) if page is None else page
+        
+        context = self.get_serializer_context()
+        requested = requested_fields(request)
+        if requested is None or self.price_prediction_field in requested:
+            context['price_predictions'] = price_service.predict_prices_bulk(
+                {getattr(obj, self.price_prediction_crop_field) for obj in objects}
+            )
+        
+        serializer = self.get_serializer(objects, many=True, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+
+class CategoryViewSet(CachedListMixin, viewsets.ModelViewSet):
     """
     ViewSet for crop categories
     """
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated]
+    list_cache_group = 'categories'
 
     def get_permissions(self):
         """Allow read-only access for list and retrieve"""
@@ -57,14 +148,20 @@ class CategoryViewSet(viewsets.ModelViewSet):
             return [AllowAny()]
         return [IsAuthenticated()]
 
+    def get_queryset(self):
+        return Category.objects.annotate(num_crops=Count('crops'))
+
 
-class CropViewSet(viewsets.ModelViewSet):
+class CropViewSet(CachedListMixin, BatchedPricePredictionMixin, viewsets.ModelViewSet):
     """
     ViewSet for crops with ML predictions
     """
     queryset = Crop.objects.all()
     serializer_class = CropSerializer
     permission_classes = [IsAuthenticated]
+    list_cache_group = 'crops'
+    price_prediction_crop_field = 'id'
+    price_prediction_field = 'price_prediction'
 
     def get_permissions(self):
         """Allow read-only access for list and retrieve"""
@@ -73,18 +170,24 @@ class CropViewSet(viewsets.ModelViewSet):
         return [IsAuthenticated()]
 
     def get_queryset(self):
-        queryset = Crop.objects.all()
+        queryset = Crop.objects.select_related('category').annotate(
+            num_active_listings=Count('listings', filter=Q(listings__status='active'))
+        )
         category = self.request.query_params.get('category', None)
         search = self.request.query_params.get('search', None)
         
         if category:
             queryset = queryset.filter(category__name__icontains=category)
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | 
-                Q(scientific_name__icontains=search) |
-                Q(variety__icontains=search)
-            )
+            query = prefix_search_query(search)
+            queryset = queryset.filter(search_vector=query) if query else queryset.none()
+        
+        if self.action == 'price_history':
+            queryset = queryset.prefetch_related(Prefetch(
+                'market_prices',
+                queryset=MarketPrice.objects.select_related('crop').order_by('-date')[:30],
+                to_attr='recent_prices'
+            ))
         
         return queryset
 
@@ -92,8 +195,7 @@ class CropViewSet(viewsets.ModelViewSet):
     def price_history(self, request, pk=None):
         """Get price history for a crop"""
         crop = self.get_object()
-        prices = crop.market_prices.order_by('-date')[:30]
-        return Response(MarketPriceSerializer(prices, many=True).data)
+        return Response(MarketPriceSerializer(crop.recent_prices, many=True).data)
 
     @action(detail=True, methods=['get'])
     def market_analysis(self, request, pk=None):
@@ -117,16 +219,26 @@ class CropViewSet(viewsets.ModelViewSet):
         return Response(analysis)
 
 
-class CropListingViewSet(viewsets.ModelViewSet):
+class CropListingViewSet(BatchedPricePredictionMixin, viewsets.ModelViewSet):
     """
     ViewSet for crop listings with ML features
     """
     queryset = CropListing.objects.all()
     serializer_class = CropListingSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
-        queryset = CropListing.objects.all()
+        queryset = CropListing.objects.select_related(
+            'farmer', 'farmer__farmer_profile', 'crop', 'crop__category'
+        ).prefetch_related(
+            # Newest first, so the latest image is simply the first prefetched one
+            Prefetch('images', queryset=CropImage.objects.order_by('-uploaded_at'))
+        ).annotate(
+            farmer_full_name=full_name('farmer'),
+            num_contracts=Count('contracts'),
+            annotated_total_value=F('quantity_available') * F('expected_price_per_quintal')
+        )
         user = self.request.user
         
         # Filter based on user type and query parameters
@@ -145,8 +257,16 @@ class CropListingViewSet(viewsets.ModelViewSet):
         if location_filter:
             queryset = queryset.filter(farm_location__icontains=location_filter)
         
+        if self.action == 'list':
+            queryset = queryset.only(*LISTING_LIST_COLUMNS)
+        
         return queryset.order_by('-created_at')
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return CropListingListSerializer
+        return CropListingSerializer
+
     def perform_create(self, serializer):
         """Ensure only farmers can create listings"""
         if not self.request.user.is_farmer:
@@ -156,11 +276,9 @@ class CropListingViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def upload_image(self, request, pk=None):
         """Upload image for crop listing"""
-        listing = self.get_object()
-        
-        # Check if user owns the listing
-        if listing.farmer != request.user:
-            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        # Ownership is part of the lookup, so other users' listings are simply not found;
+        # DRF's get_object_or_404 also turns a malformed pk into a 404
+        listing = generics.get_object_or_404(CropListing.objects.only('id'), pk=pk, farmer=request.user)
         
         image_data = {
             'listing': listing.id,
@@ -186,9 +304,10 @@ class CropListingViewSet(viewsets.ModelViewSet):
             'ml_available': ML_SERVICES_AVAILABLE
         }
         
-        # Add image analysis if images exist
-        if listing.images.exists():
-            latest_image = listing.images.latest('uploaded_at')
+        # Add image analysis if images exist; prefetched newest first by get_queryset
+        images = listing.images.all()
+        if images:
+            latest_image = images[0]
             insights['image_analysis'] = {
                 'health_score': latest_image.health_score,
                 'ripeness_score': latest_image.ripeness_score,
@@ -205,10 +324,25 @@ class ContractViewSet(viewsets.ModelViewSet):
     queryset = Contract.objects.all()
     serializer_class = ContractSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Contract.objects.all()
+        queryset = Contract.objects.select_related(
+            'farmer', 'buyer', 'listing__crop'
+        ).prefetch_related(
+            # Only the latest few updates are serialized with each contract
+            Prefetch(
+                'progress_updates',
+                queryset=ContractProgress.objects.select_related('updated_by').prefetch_related(
+                    'progress_images'
+                ).order_by('-update_date')[:RECENT_PROGRESS_UPDATES],
+                to_attr='recent_progress'
+            )
+        ).annotate(
+            farmer_full_name=full_name('farmer'),
+            buyer_full_name=full_name('buyer')
+        )
         
         # Filter contracts based on user role
         if user.is_farmer:
@@ -223,6 +357,26 @@ class ContractViewSet(viewsets.ModelViewSet):
         
         return queryset.order_by('-created_at')
 
+    def list(self, request, *args, **kwargs):
+        """
+        Risk assessments for the whole page share one farmer and one buyer history
+        query, handed to the serializer as context['party_stats']
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        contracts = list(queryset) if page is None else page
+        
+        context = self.get_serializer_context()
+        requested = requested_fields(request)
+        if requested is None or 'risk_assessment' in requested:
+            context['party_stats'] = risk_service.get_party_stats_bulk(contracts)
+            risk_service.warm_crop_volatility({contract.listing.crop_id for contract in contracts})
+        
+        serializer = self.get_serializer(contracts, many=True, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
     def perform_create(self, serializer):
         """Ensure only buyers can create contracts"""
         if not self.request.user.is_buyer:
@@ -235,38 +389,44 @@ class ContractViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def update_progress(self, request, pk=None):
         """Update contract progress"""
-        contract = self.get_object()
-        
-        # Check permissions
-        if request.user not in [contract.farmer, contract.buyer]:
-            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        # Only the contract parties can find the contract
+        # The party ids are loaded for the Contract post_save receivers run by the progress save
+        contract = generics.get_object_or_404(
+            Contract.objects.only('id', 'farmer_id', 'buyer_id'), Q(farmer=request.user) | Q(buyer=request.user), pk=pk
+        )
         
         progress_data = {
-            'contract': contract.id,
             'progress_percentage': request.data.get('progress_percentage'),
             'notes': request.data.get('notes', ''),
         }
         
         serializer = ContractProgressSerializer(data=progress_data, context={'request': request})
         if serializer.is_valid():
-            serializer.save()
+            serializer.save(contract=contract)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=True, methods=['post'])
     def complete_contract(self, request, pk=None):
         """Mark contract as completed"""
-        contract = self.get_object()
+        contract = generics.get_object_or_404(
+            Contract.objects.only('farmer_id', 'buyer_id'), Q(farmer=request.user) | Q(buyer=request.user), pk=pk
+        )
         
         # Check permissions (usually farmer completes delivery)
-        if request.user != contract.farmer:
+        if contract.farmer_id != request.user.id:
             return Response({'error': 'Only farmer can mark contract as completed'}, 
                           status=status.HTTP_403_FORBIDDEN)
         
-        contract.status = 'completed'
-        contract.completion_percentage = 100.0
-        contract.actual_delivery_date = timezone.now().date()
-        contract.save()
+        # Write just the changed columns; update() skips post_save, so the caches are dropped here
+        update_fields = {
+            'status': 'completed',
+            'completion_percentage': 100.0,
+            'actual_delivery_date': timezone.now().date(),
+            'updated_at': timezone.now(),
+        }
+        Contract.objects.filter(pk=contract.pk).update(**update_fields)
+        caching.invalidate_contract(contract.farmer_id, contract.buyer_id)
         
         return Response({'message': 'Contract marked as completed'})
 
@@ -275,16 +435,7 @@ class ContractViewSet(viewsets.ModelViewSet):
         """Get detailed risk analysis for contract"""
         contract = self.get_object()
         
-        if ML_SERVICES_AVAILABLE:
-            risk_assessment = risk_service.assess_contract_risk(contract)
-        else:
-            risk_assessment = {
-                'overall_risk_score': 0.5,
-                'risk_level': 'medium',
-                'message': 'ML services unavailable - using default assessment'
-            }
-        
-        return Response(risk_assessment)
+        return Response(risk_service.assess_contract_risk(contract))
 
 
 class ReviewViewSet(viewsets.ModelViewSet):
@@ -294,10 +445,15 @@ class ReviewViewSet(viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Review.objects.all()
+        # contract_details reads the contract's crop
+        queryset = Review.objects.select_related('contract__listing__crop').annotate(
+            reviewer_full_name=full_name('reviewer'),
+            reviewee_full_name=full_name('reviewee')
+        )
         
         # Filter based on query parameters
         for_user = self.request.query_params.get('for_user', None)
@@ -318,38 +474,48 @@ def dashboard_data(request):
     Get dashboard data based on user type
     """
     user = request.user
-    
+    dashboard_data = cache.get_or_set(
+        caching.dashboard_cache_key(user.id),
+        lambda: build_dashboard_data(user),
+        caching.DASHBOARD_CACHE_TIMEOUT
+    )
+    return Response(dashboard_data)
+
+
+def build_dashboard_data(user):
+    """Dashboard payload for a user, cached by dashboard_data"""
     if user.is_farmer:
         # Farmer dashboard data
-        listings = CropListing.objects.filter(farmer=user)
-        contracts = Contract.objects.filter(farmer=user)
+        listing_counts = CropListing.objects.filter(farmer=user).aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(status='active'))
+        )
+        contract_totals = _contract_totals(Contract.objects.filter(farmer=user))
         
         dashboard_data = {
             'user_type': 'farmer',
-            'total_listings': listings.count(),
-            'active_listings': listings.filter(status='active').count(),
-            'active_contracts': contracts.filter(status__in=['active', 'in_progress']).count(),
-            'completed_contracts': contracts.filter(status='completed').count(),
-            'total_earnings': contracts.filter(status='completed').aggregate(
-                total=Sum('total_contract_value'))['total'] or 0,
+            'total_listings': listing_counts['total'],
+            'active_listings': listing_counts['active'],
+            'active_contracts': contract_totals['active'],
+            'completed_contracts': contract_totals['completed'],
+            'total_earnings': contract_totals['completed_value'] or 0,
             'recent_activities': get_recent_activities(user, 'farmer'),
-            'ml_insights': get_farmer_ml_insights(user) if ML_SERVICES_AVAILABLE else {},
+            'ml_insights': get_farmer_ml_insights(user),
             'ml_available': ML_SERVICES_AVAILABLE
         }
     
     elif user.is_buyer:
         # Buyer dashboard data
-        contracts = Contract.objects.filter(buyer=user)
+        contract_totals = _contract_totals(Contract.objects.filter(buyer=user))
         
         dashboard_data = {
             'user_type': 'buyer',
-            'total_contracts': contracts.count(),
-            'active_contracts': contracts.filter(status__in=['active', 'in_progress']).count(),
-            'completed_contracts': contracts.filter(status='completed').count(),
-            'total_spent': contracts.filter(status='completed').aggregate(
-                total=Sum('total_contract_value'))['total'] or 0,
+            'total_contracts': contract_totals['total'],
+            'active_contracts': contract_totals['active'],
+            'completed_contracts': contract_totals['completed'],
+            'total_spent': contract_totals['completed_value'] or 0,
             'recent_activities': get_recent_activities(user, 'buyer'),
-            'ml_insights': get_buyer_ml_insights(user) if ML_SERVICES_AVAILABLE else {},
+            'ml_insights': get_buyer_ml_insights(user),
             'ml_available': ML_SERVICES_AVAILABLE
         }
     
@@ -360,7 +526,7 @@ def dashboard_data(request):
             'ml_available': ML_SERVICES_AVAILABLE
         }
     
-    return Response(dashboard_data)
+    return dashboard_data
 
 
 @api_view(['POST'])
@@ -369,13 +535,6 @@ def predict_price(request):
     """
     ML endpoint for price prediction
     """
-    if not ML_SERVICES_AVAILABLE:
-        return Response({
-            'error': 'ML services not available', 
-            'predicted_price': 100,
-            'method': 'unavailable'
-        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-    
     serializer = PricePredictionSerializer(data=request.data)
     if serializer.is_valid():
         try:
@@ -395,19 +554,34 @@ def predict_price(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def predict_price_batch(request):
+    """
+    ML endpoint for price prediction of several items in one request
+    """
+    serializer = PriceBatchPredictionSerializer(data=request.data)
+    if serializer.is_valid():
+        try:
+            predictions = price_service.predict_price_batch([
+                {**item, 'quantity': float(item['quantity'])}
+                for item in serializer.validated_data['items']
+            ])
+            return Response({'predictions': predictions})
+        except Exception as e:
+            return Response({
+                'error': str(e),
+                'method': 'error_fallback'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def assess_quality(request):
     """
     ML endpoint for quality assessment
     """
-    if not ML_SERVICES_AVAILABLE:
-        return Response({
-            'error': 'ML services not available',
-            'quality_score': 0.7,
-            'method': 'unavailable'
-        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-    
     if 'image' not in request.FILES:
         return Response({'error': 'Image file required'}, status=status.HTTP_400_BAD_REQUEST)
     
@@ -425,13 +599,6 @@ def predict_yield(request):
     """
     ML endpoint for yield prediction
     """
-    if not ML_SERVICES_AVAILABLE:
-        return Response({
-            'error': 'ML services not available',
-            'predicted_yield': 10,
-            'method': 'unavailable'
-        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-    
     serializer = YieldPredictionSerializer(data=request.data)
     if serializer.is_valid():
         try:
@@ -458,29 +625,57 @@ def market_trends(request):
     """
     Get market trends and insights
     """
+    trends_data = cache.get_or_set(
+        caching.MARKET_TRENDS_CACHE_KEY, build_market_trends, caching.MARKET_TRENDS_CACHE_TIMEOUT
+    )
+    return Response(trends_data)
+
+
+def build_market_trends():
+    """Market trends payload, cached by market_trends"""
     # Get trending crops
-    trending_crops = Crop.objects.annotate(
+    trending_crops = list(Crop.objects.select_related('category').annotate(
         listings_count=Count('listings'),
-        avg_price=Avg('market_prices__price_per_quintal')
-    ).filter(listings_count__gt=0).order_by('-listings_count')[:10]
+        num_active_listings=Count('listings', filter=Q(listings__status='active'))
+    ).filter(listings_count__gt=0).order_by('-listings_count')[:10])
+    # Predicted in one pass for CropSerializer, as in the crop list
+    price_predictions = price_service.predict_prices_bulk(crop.id for crop in trending_crops)
     
     # Get recent price changes
     recent_prices = MarketPrice.objects.filter(
         date__gte=timezone.now().date() - timedelta(days=7)
-    ).order_by('-date')[:20]
+    ).select_related('crop').order_by('-date')[:20]
+    
+    contract_summary = Contract.objects.aggregate(
+        active=Count('id', filter=Q(status__in=['active', 'in_progress'])),
+        avg_value=Avg('total_contract_value')
+    )
     
     trends_data = {
-        'trending_crops': CropSerializer(trending_crops, many=True).data,
+        'trending_crops': CropSerializer(
+            trending_crops, many=True, context={'price_predictions': price_predictions}
+        ).data,
         'recent_price_updates': MarketPriceSerializer(recent_prices, many=True).data,
         'market_summary': {
             'total_active_listings': CropListing.objects.filter(status='active').count(),
-            'total_active_contracts': Contract.objects.filter(status__in=['active', 'in_progress']).count(),
-            'avg_contract_value': Contract.objects.aggregate(avg=Avg('total_contract_value'))['avg'] or 0
+            'total_active_contracts': contract_summary['active'],
+            'avg_contract_value': contract_summary['avg_value'] or 0
         },
         'ml_available': ML_SERVICES_AVAILABLE
     }
     
-    return Response(trends_data)
+    return trends_data
+
+
+def _contract_totals(contracts):
+    """Dashboard contract counters and completed value, in one conditional aggregate query"""
+    completed = Q(status='completed')
+    return contracts.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status__in=['active', 'in_progress'])),
+        completed=Count('id', filter=completed),
+        completed_value=Sum('total_contract_value', filter=completed)
+    )
 
 
 def get_recent_activities(user, user_type):
@@ -490,34 +685,40 @@ def get_recent_activities(user, user_type):
     try:
         if user_type == 'farmer':
             # Recent listings
-            recent_listings = CropListing.objects.filter(farmer=user).order_by('-created_at')[:5]
+            recent_listings = CropListing.objects.filter(farmer=user).order_by('-created_at').values(
+                'listing_id', 'created_at', 'crop__name'
+            )[:5]
             for listing in recent_listings:
                 activities.append({
                     'type': 'listing_created',
-                    'description': f"Created listing for {listing.crop.name}",
-                    'date': listing.created_at,
-                    'data': {'listing_id': str(listing.listing_id)}
+                    'description': f"Created listing for {listing['crop__name']}",
+                    'date': listing['created_at'],
+                    'data': {'listing_id': str(listing['listing_id'])}
                 })
             
             # Recent contract updates
-            recent_contracts = Contract.objects.filter(farmer=user).order_by('-updated_at')[:3]
+            recent_contracts = Contract.objects.filter(farmer=user).order_by('-updated_at').values(
+                'contract_id', 'status', 'updated_at'
+            )[:3]
             for contract in recent_contracts:
                 activities.append({
                     'type': 'contract_update',
-                    'description': f"Contract status: {contract.status}",
-                    'date': contract.updated_at,
-                    'data': {'contract_id': str(contract.contract_id)}
+                    'description': f"Contract status: {contract['status']}",
+                    'date': contract['updated_at'],
+                    'data': {'contract_id': str(contract['contract_id'])}
                 })
         
         elif user_type == 'buyer':
             # Recent contracts
-            recent_contracts = Contract.objects.filter(buyer=user).order_by('-created_at')[:5]
+            recent_contracts = Contract.objects.filter(buyer=user).order_by('-created_at').values(
+                'contract_id', 'created_at', 'listing__crop__name'
+            )[:5]
             for contract in recent_contracts:
                 activities.append({
                     'type': 'contract_created',
-                    'description': f"Created contract for {contract.listing.crop.name}",
-                    'date': contract.created_at,
-                    'data': {'contract_id': str(contract.contract_id)}
+                    'description': f"Created contract for {contract['listing__crop__name']}",
+                    'date': contract['created_at'],
+                    'data': {'contract_id': str(contract['contract_id'])}
                 })
     except Exception as e:
         print(f"Error getting recent activities: {e}")
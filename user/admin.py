@@ -2,6 +2,10 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from .models import User, FarmerProfile, BuyerProfile
 
+def is_changelist(request):
+    """Whether the admin request is for a list page, which doesn't show the long text fields"""
+    return request.resolver_match is not None and request.resolver_match.url_name.endswith('_changelist')
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     list_display = ['username', 'email', 'first_name', 'last_name', 'user_type', 'is_active', 'date_joined']
@@ -18,12 +22,32 @@ class UserAdmin(BaseUserAdmin):
 
 @admin.register(FarmerProfile)
 class FarmerProfileAdmin(admin.ModelAdmin):
-    list_display = ['user', 'land_size', 'farming_type', 'experience_years']
+    list_display = ['user', 'land_size', 'farming_type', 'experience_years', 'completion']
     list_filter = ['farming_type']
     search_fields = ['user__username', 'user__phone_number']
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related('user')
+        if is_changelist(request):
+            queryset = queryset.defer('specializations', 'certifications', 'farm_address')
+        return queryset
+
+    @admin.display(description='Completion %', ordering='completion_percentage')
+    def completion(self, obj):
+        return round(obj.completion_percentage)
+
 @admin.register(BuyerProfile)
 class BuyerProfileAdmin(admin.ModelAdmin):
-    list_display = ['user', 'company_name', 'business_type', 'gst_number']
+    list_display = ['user', 'company_name', 'business_type', 'gst_number', 'completion']
     list_filter = ['business_type']
-    search_fields = ['user__username', 'company_name', 'user__phone_number']
\ No newline at end of file
+    search_fields = ['user__username', 'company_name', 'user__phone_number']
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related('user')
+        if is_changelist(request):
+            queryset = queryset.defer('preferred_crops', 'business_address', 'company_logo')
+        return queryset
+
+    @admin.display(description='Completion %', ordering='completion_percentage')
+    def completion(self, obj):
+        return round(obj.completion_percentage)
\ No newline at end of file
@@ -0,0 +1,47 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# User columns read by the API views and serializers; updated_at is kept so
+# saving request.user still refreshes it
+REQUEST_USER_COLUMNS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'user_type', 'phone_number',
+    'location', 'is_verified', 'is_active', 'date_joined', 'updated_at',
+)
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication loading request.user with only the columns the API uses
+    and both profiles joined, so has_profile and the profile lookups need no
+    further queries
+    """
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        columns = REQUEST_USER_COLUMNS
+        if api_settings.CHECK_REVOKE_TOKEN:
+            columns += ('password',)
+
+        profiles = ('farmer_profile', 'buyer_profile')
+        queryset = self.user_model.objects.select_related(*profiles).only(*columns, *profiles)
+        try:
+            user = queryset.get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
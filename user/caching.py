@@ -0,0 +1,33 @@
+"""
+Cache of the serialized user profile.
+
+Profiles are read far more often than written, so the profile endpoint caches
+its JSON and returns it as is. Saves only drop the entry, once their transaction
+commits, and the next read renders it again. The TTL bounds how long workers
+with their own cache (the default LocMemCache) can serve an old copy; a shared
+backend such as Redis or memcached makes the invalidation immediate everywhere.
+"""
+import json
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .serializers import serialize_user
+
+PROFILE_CACHE_TIMEOUT = 300
+
+
+def profile_cache_key(user_id):
+    return f'user:profile:{user_id}'
+
+
+def cache_profile(user):
+    """Store the user's profile JSON, rendered like DRF's JSONRenderer, and return it"""
+    blob = json.dumps(serialize_user(user), ensure_ascii=False, separators=(',', ':')).encode()
+    cache.set(profile_cache_key(user.pk), blob, PROFILE_CACHE_TIMEOUT)
+    return blob
+
+
+def invalidate_profile(user_id):
+    """Drop the cached profile once the current transaction commits, so a rollback can't leave it stale"""
+    transaction.on_commit(lambda: cache.delete(profile_cache_key(user_id)))
@@ -0,0 +1,26 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from user.views import _API_OVERVIEW_JSON
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the API overview JSON into STATIC_ROOT so the web server can serve "
+        "/api/overview/ as a static file (run after collectstatic)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=os.path.join(settings.STATIC_ROOT, 'api_overview.json'),
+            help="Path of the JSON file to write"
+        )
+
+    def handle(self, *args, **options):
+        output = options['output']
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        with open(output, 'wb') as f:
+            f.write(_API_OVERVIEW_JSON)
+        self.stdout.write(self.style.SUCCESS(f"Wrote the API overview to {output}"))
@@ -0,0 +1,20 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0001_initial'),
+        # Installs the pg_trgm extension providing gin_trgm_ops
+        ('contract', '0007_croplisting_location_trgm_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='buyerprofile',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['company_name'], name='buyer_company_trgm_idx', opclasses=['gin_trgm_ops']
+            ),
+        ),
+    ]
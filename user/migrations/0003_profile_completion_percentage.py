@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-15 20:36
+
+from django.db import migrations, models
+
+# COMPLETION_FIELDS as of this migration
+COMPLETION_FIELDS = {
+    'FarmerProfile': ('land_size', 'farming_type', 'aadhaar_number', 'farm_address', 'pincode', 'experience_years'),
+    'BuyerProfile': ('company_name', 'gst_number', 'business_type', 'business_address', 'pincode', 'preferred_crops'),
+}
+
+
+def backfill_completion_percentage(apps, schema_editor):
+    for model_name, fields in COMPLETION_FIELDS.items():
+        model = apps.get_model('user', model_name)
+        profiles = []
+        for profile in model.objects.only('id', *fields).iterator(chunk_size=2000):
+            filled_fields = sum(1 for field in fields if getattr(profile, field))
+            profile.completion_percentage = (filled_fields / len(fields)) * 100
+            profiles.append(profile)
+        model.objects.bulk_update(profiles, ['completion_percentage'], batch_size=500)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0002_buyerprofile_company_trgm_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='buyerprofile',
+            name='completion_percentage',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='farmerprofile',
+            name='completion_percentage',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.RunPython(backfill_completion_percentage, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import RegexValidator
 
 class User(AbstractUser):
@@ -81,6 +82,9 @@ class FarmerProfile(models.Model):
     specializations = models.TextField(blank=True, null=True, help_text="Crops you specialize in")
     certifications = models.TextField(blank=True, null=True, help_text="Any farming certifications")
     
+    # Stored on save from COMPLETION_FIELDS (see user.signals)
+    completion_percentage = models.FloatField(default=0.0, editable=False)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -88,12 +92,13 @@ class FarmerProfile(models.Model):
     def __str__(self):
         return f"Farmer Profile - {self.user.username}"
 
-    @property
-    def completion_percentage(self):
+    # Fields counted by completion_percentage
+    COMPLETION_FIELDS = ('land_size', 'farming_type', 'aadhaar_number', 'farm_address', 'pincode', 'experience_years')
+
+    def calculate_completion_percentage(self):
         """Calculate profile completion percentage"""
-        fields = ['land_size', 'farming_type', 'aadhaar_number', 'farm_address', 'pincode', 'experience_years']
-        filled_fields = sum(1 for field in fields if getattr(self, field))
-        return (filled_fields / len(fields)) * 100
+        filled_fields = sum(1 for field in self.COMPLETION_FIELDS if getattr(self, field))
+        return (filled_fields / len(self.COMPLETION_FIELDS)) * 100
 
 
 class BuyerProfile(models.Model):
@@ -130,16 +135,27 @@ class BuyerProfile(models.Model):
     contact_person_name = models.CharField(max_length=100, blank=True, null=True)
     contact_person_designation = models.CharField(max_length=100, blank=True, null=True)
     
+    # Stored on save from COMPLETION_FIELDS (see user.signals)
+    completion_percentage = models.FloatField(default=0.0, editable=False)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Trigram index for the admin's company_name icontains search
+            GinIndex(fields=['company_name'], name='buyer_company_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
+
     def __str__(self):
         return f"Buyer Profile - {self.company_name or self.user.username}"
 
-    @property
-    def completion_percentage(self):
+    # Fields counted by completion_percentage
+    COMPLETION_FIELDS = ('company_name', 'gst_number', 'business_type', 'business_address', 'pincode', 'preferred_crops')
+
+    def calculate_completion_percentage(self):
         """Calculate profile completion percentage"""
-        fields = ['company_name', 'gst_number', 'business_type', 'business_address', 'pincode', 'preferred_crops']
-        filled_fields = sum(1 for field in fields if getattr(self, field))
-        return (filled_fields / len(fields)) * 100
\ No newline at end of file
+        filled_fields = sum(1 for field in self.COMPLETION_FIELDS if getattr(self, field))
+        return (filled_fields / len(self.COMPLETION_FIELDS)) * 100
+
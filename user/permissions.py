@@ -0,0 +1,21 @@
+from rest_framework import permissions
+
+
+class IsFarmer(permissions.BasePermission):
+    """
+    Allows access only to authenticated farmers
+    """
+    message = 'Only farmers can access this endpoint'
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.is_farmer
+
+
+class IsBuyer(permissions.BasePermission):
+    """
+    Allows access only to authenticated buyers
+    """
+    message = 'Only buyers can access this endpoint'
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.is_buyer
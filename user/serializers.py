@@ -1,6 +1,12 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils.crypto import constant_time_compare, salted_hmac
+import hashlib
+
 from .models import User, FarmerProfile, BuyerProfile
 
 
@@ -8,7 +14,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration
     """
-    password = serializers.CharField(write_only=True, validators=[validate_password])
+    password = serializers.CharField(write_only=True)
     password_confirm = serializers.CharField(write_only=True)
 
     class Meta:
@@ -19,6 +25,11 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         if attrs['password'] != attrs['password_confirm']:
             raise serializers.ValidationError("Passwords don't match")
+        # The password validators only run once the confirmation matches
+        try:
+            validate_password(attrs['password'])
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'password': list(e.messages)})
         return attrs
 
     def validate_user_type(self, value):
@@ -29,12 +40,60 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data.pop('password_confirm')
         password = validated_data.pop('password')
-        user = User.objects.create_user(**validated_data)
+        # What create_user does, with the password hashed once and a single INSERT
+        validated_data['username'] = User.normalize_username(validated_data['username'])
+        validated_data['email'] = User.objects.normalize_email(validated_data.get('email'))
+        user = User(**validated_data)
         user.set_password(password)
-        user.save()
+        # A new user has no profiles yet; caching that spares has_profile a lookup
+        for relation in ('farmer_profile', 'buyer_profile'):
+            User._meta.get_field(relation).set_cached_value(user, None)
+        user.save(force_insert=True)
         return user
 
 
+LOGIN_CACHE_TIMEOUT = 60
+
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+
+# blake2b keys are limited to 64 bytes
+LOGIN_DIGEST_KEY = hashlib.sha256(settings.SECRET_KEY.encode()).digest()
+
+
+def login_cache_key(username, password):
+    """Cache key for a set of credentials; only a keyed digest of them is stored"""
+    digest = hashlib.blake2b(
+        f'{username}\0{password}'.encode(), key=LOGIN_DIGEST_KEY, digest_size=16
+    )
+    return f'auth:{digest.hexdigest()}'
+
+
+def password_fingerprint(user):
+    """Keyed digest of the user's stored password hash, to notice password changes without caching the hash"""
+    return salted_hmac('login-cache', user.password).hexdigest()
+
+
+def cached_authenticate(username, password):
+    """
+    authenticate() that remembers successful logins for LOGIN_CACHE_TIMEOUT
+    seconds, so repeated logins with the same credentials skip the password hasher.
+    Only logins checked by ModelBackend are cached, since a cache hit skips the
+    authentication backends altogether
+    """
+    key = login_cache_key(username, password)
+    cached = cache.get(key)
+    if cached:
+        user_id, fingerprint = cached
+        user = User.objects.filter(pk=user_id).first()
+        # A changed password (or a deactivated account) must not be served from the cache
+        if user and user.is_active and constant_time_compare(password_fingerprint(user), fingerprint):
+            return user
+    user = authenticate(username=username, password=password)
+    if user and getattr(user, 'backend', None) == MODEL_BACKEND:
+        cache.set(key, (user.pk, password_fingerprint(user)), LOGIN_CACHE_TIMEOUT)
+    return user
+
+
 class UserLoginSerializer(serializers.Serializer):
     """
     Serializer for user login
@@ -47,7 +106,7 @@ class UserLoginSerializer(serializers.Serializer):
         password = attrs.get('password')
 
         if username and password:
-            user = authenticate(username=username, password=password)
+            user = cached_authenticate(username, password)
             if not user:
                 raise serializers.ValidationError('Invalid credentials')
             if not user.is_active:
@@ -72,16 +131,67 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'username', 'is_verified', 'date_joined')
 
 
-class FarmerProfileSerializer(serializers.ModelSerializer):
+def serialize_user(u):
+    """The UserProfileSerializer representation built directly, for the auth, dashboard and cached profile responses"""
+    return {
+        'id': u.id,
+        'username': u.username,
+        'email': u.email,
+        'first_name': u.first_name,
+        'last_name': u.last_name,
+        'user_type': u.user_type,
+        'phone_number': u.phone_number,
+        'location': u.location,
+        'is_verified': u.is_verified,
+        'has_profile': u.has_profile,
+        # Same format as DRF's DateTimeField under TIME_ZONE = 'UTC'
+        'date_joined': u.date_joined.isoformat().replace('+00:00', 'Z'),
+    }
+
+
+# User columns behind the nested user_info, for profile queries joining their user
+USER_INFO_COLUMNS = tuple(
+    f'user__{name}' for name in UserProfileSerializer.Meta.fields if name != 'has_profile'
+)
+
+
+class SuppliedUserInfoMixin:
+    """
+    user_info handling shared by the profile serializers. Callers that already
+    serialized the profile's user can pass it as context['user_info'] instead of
+    having user_info serialize it again
+    """
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the user behind user_info, reading only the columns it serializes"""
+        profile_columns = [field.name for field in queryset.model._meta.concrete_fields]
+        return queryset.select_related('user').only(*profile_columns, *USER_INFO_COLUMNS)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if 'user_info' in self.context:
+            del fields['user_info']
+        return fields
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if 'user_info' in self.context:
+            data['user_info'] = self.context['user_info']
+        return data
+
+
+class FarmerProfileSerializer(SuppliedUserInfoMixin, serializers.ModelSerializer):
     """
     Serializer for farmer profile
     """
-    completion_percentage = serializers.ReadOnlyField()
     user_info = UserProfileSerializer(source='user', read_only=True)
 
     class Meta:
         model = FarmerProfile
-        fields = '__all__'
+        fields = ('id', 'completion_percentage', 'user_info', 'land_size', 'farming_type',
+                 'aadhaar_number', 'profile_picture', 'farm_address', 'pincode',
+                 'experience_years', 'specializations', 'certifications',
+                 'created_at', 'updated_at', 'user')
         read_only_fields = ('user', 'created_at', 'updated_at')
 
     def create(self, validated_data):
@@ -90,16 +200,18 @@ class FarmerProfileSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class BuyerProfileSerializer(serializers.ModelSerializer):
+class BuyerProfileSerializer(SuppliedUserInfoMixin, serializers.ModelSerializer):
     """
     Serializer for buyer profile
     """
-    completion_percentage = serializers.ReadOnlyField()
     user_info = UserProfileSerializer(source='user', read_only=True)
 
     class Meta:
         model = BuyerProfile
-        fields = '__all__'
+        fields = ('id', 'completion_percentage', 'user_info', 'company_name', 'gst_number',
+                 'business_type', 'business_address', 'pincode', 'company_logo', 'website',
+                 'annual_turnover', 'preferred_crops', 'contact_person_name',
+                 'contact_person_designation', 'created_at', 'updated_at', 'user')
         read_only_fields = ('user', 'created_at', 'updated_at')
 
     def create(self, validated_data):
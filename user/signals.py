@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .caching import invalidate_profile
+from .models import BuyerProfile, FarmerProfile, User
+
+
+@receiver(pre_save, sender=FarmerProfile)
+@receiver(pre_save, sender=BuyerProfile)
+def store_completion_percentage(sender, instance, **kwargs):
+    """Keep the stored completion_percentage in step with the profile fields"""
+    instance.completion_percentage = instance.calculate_completion_percentage()
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_profile(sender, instance, **kwargs):
+    """The cached profile JSON is rendered from the user row"""
+    invalidate_profile(instance.pk)
+
+
+@receiver(post_save, sender=FarmerProfile)
+@receiver(post_save, sender=BuyerProfile)
+def invalidate_profile_on_create(sender, instance, created, **kwargs):
+    """A new profile flips has_profile in the cached JSON"""
+    if created:
+        invalidate_profile(instance.user_id)
+
+
+@receiver(post_delete, sender=FarmerProfile)
+@receiver(post_delete, sender=BuyerProfile)
+def invalidate_profile_on_delete(sender, instance, **kwargs):
+    """A removed profile flips has_profile in the cached JSON"""
+    invalidate_profile(instance.user_id)
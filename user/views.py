@@ -3,80 +3,111 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.core.cache import cache
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
+import json
 
 from .models import User, FarmerProfile, BuyerProfile
+from .permissions import IsBuyer, IsFarmer
 from .serializers import (
     UserRegistrationSerializer, 
     UserLoginSerializer, 
     UserProfileSerializer,
     FarmerProfileSerializer, 
-    BuyerProfileSerializer
+    BuyerProfileSerializer,
+    serialize_user,
 )
+from .caching import cache_profile, profile_cache_key
+
+
+# The overview is static, so it is rendered to JSON once at import
+API_URLS = {
+    'Authentication': {
+        'Register': '/api/auth/register/',
+        'Login': '/api/auth/login/',
+        'Refresh Token': '/api/auth/token/refresh/',
+        'User Profile': '/api/auth/profile/',
+        'Dashboard': '/api/dashboard/',
+    },
+    'Profiles': {
+        'Farmer Profile': '/api/farmer-profile/',
+        'Buyer Profile': '/api/buyer-profile/',
+    },
+    'Contract System': {
+        'Categories': '/api/contract/categories/',
+        'Crops': '/api/contract/crops/',
+        'Crop Listings': '/api/contract/listings/',
+        'Contracts': '/api/contract/contracts/',
+        'Reviews': '/api/contract/reviews/',
+        'Dashboard': '/api/contract/dashboard/',
+        'Market Trends': '/api/contract/market-trends/',
+    },
+    'Machine Learning (Simplified)': {
+        'Price Prediction': '/api/contract/ml/predict-price/',
+        'Batch Price Prediction': '/api/contract/ml/predict-price-batch/',
+        'Quality Assessment': '/api/contract/ml/assess-quality/',
+        'Yield Prediction': '/api/contract/ml/predict-yield/',
+    },
+    'Advanced Features': {
+        'Crop Price History': '/api/contract/crops/{id}/price_history/',
+        'Market Analysis': '/api/contract/crops/{id}/market_analysis/',
+        'Upload Crop Images': '/api/contract/listings/{id}/upload_image/',
+        'ML Insights': '/api/contract/listings/{id}/ml_insights/',
+        'Contract Progress': '/api/contract/contracts/{id}/update_progress/',
+        'Complete Contract': '/api/contract/contracts/{id}/complete_contract/',
+        'Risk Analysis': '/api/contract/contracts/{id}/risk_analysis/',
+    },
+    'Core APIs': {
+        'API Overview': '/api/overview/',
+        'DRF Browsable API': '/api/',
+        'Admin Panel': '/admin/',
+    },
+    'System Info': {
+        'Version': '1.0.0',
+        'ML Status': 'Simplified (Heavy ML disabled for better performance)',
+        'Features': [
+            'User Authentication & Profiles',
+            'Crop Listings & Management', 
+            'Contract Creation & Tracking',
+            'Progress Updates with Images',
+            'Reviews & Ratings System',
+            'Market Trends & Analytics',
+            'Simplified ML Predictions',
+            'Dashboard & Insights'
+        ]
+    }
+}
+_API_OVERVIEW_JSON = json.dumps(API_URLS).encode()
 
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
+@require_GET
 def api_overview(request):
     """
     API Overview - Lists available endpoints
     """
-    api_urls = {
-        'Authentication': {
-            'Register': '/api/auth/register/',
-            'Login': '/api/auth/login/',
-            'Refresh Token': '/api/auth/token/refresh/',
-            'User Profile': '/api/auth/profile/',
-            'Dashboard': '/api/dashboard/',
-        },
-        'Profiles': {
-            'Farmer Profile': '/api/farmer-profile/',
-            'Buyer Profile': '/api/buyer-profile/',
-        },
-        'Contract System': {
-            'Categories': '/api/contract/categories/',
-            'Crops': '/api/contract/crops/',
-            'Crop Listings': '/api/contract/listings/',
-            'Contracts': '/api/contract/contracts/',
-            'Reviews': '/api/contract/reviews/',
-            'Dashboard': '/api/contract/dashboard/',
-            'Market Trends': '/api/contract/market-trends/',
-        },
-        'Machine Learning (Simplified)': {
-            'Price Prediction': '/api/contract/ml/predict-price/',
-            'Quality Assessment': '/api/contract/ml/assess-quality/',
-            'Yield Prediction': '/api/contract/ml/predict-yield/',
-        },
-        'Advanced Features': {
-            'Crop Price History': '/api/contract/crops/{id}/price_history/',
-            'Market Analysis': '/api/contract/crops/{id}/market_analysis/',
-            'Upload Crop Images': '/api/contract/listings/{id}/upload_image/',
-            'ML Insights': '/api/contract/listings/{id}/ml_insights/',
-            'Contract Progress': '/api/contract/contracts/{id}/update_progress/',
-            'Complete Contract': '/api/contract/contracts/{id}/complete_contract/',
-            'Risk Analysis': '/api/contract/contracts/{id}/risk_analysis/',
-        },
-        'Core APIs': {
-            'API Overview': '/api/overview/',
-            'DRF Browsable API': '/api/',
-            'Admin Panel': '/admin/',
-        },
-        'System Info': {
-            'Version': '1.0.0',
-            'ML Status': 'Simplified (Heavy ML disabled for better performance)',
-            'Features': [
-                'User Authentication & Profiles',
-                'Crop Listings & Management', 
-                'Contract Creation & Tracking',
-                'Progress Updates with Images',
-                'Reviews & Ratings System',
-                'Market Trends & Analytics',
-                'Simplified ML Predictions',
-                'Dashboard & Insights'
-            ]
-        }
-    }
-    return Response(api_urls)
+    return HttpResponse(_API_OVERVIEW_JSON, content_type='application/json')
+
+
+def user_with_profiles(user):
+    """
+    The user with both profile relations joined, so has_profile and the profile
+    lookups that follow don't each query the database. JWT requests already load
+    request.user that way (ProfileJWTAuthentication); others re-read it
+    """
+    if User.farmer_profile.is_cached(user) and User.buyer_profile.is_cached(user):
+        return user
+    return User.objects.select_related('farmer_profile', 'buyer_profile').get(pk=user.pk)
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    """
+    JSON response for plain payloads of known shape, encoded directly instead of
+    going through DRF's content negotiation and renderer
+    """
+    body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+    return HttpResponse(body, status=status, content_type='application/json')
 
 
 class UserRegistrationView(generics.CreateAPIView):
@@ -95,9 +126,9 @@ class UserRegistrationView(generics.CreateAPIView):
         # Generate JWT tokens
         refresh = RefreshToken.for_user(user)
         
-        return Response({
+        return json_response({
             'message': 'User registered successfully',
-            'user': UserProfileSerializer(user).data,
+            'user': serialize_user(user),
             'tokens': {
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
@@ -120,9 +151,9 @@ class UserLoginView(generics.GenericAPIView):
         # Generate JWT tokens
         refresh = RefreshToken.for_user(user)
         
-        return Response({
+        return json_response({
             'message': 'Login successful',
-            'user': UserProfileSerializer(user).data,
+            'user': serialize_user(user),
             'tokens': {
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
@@ -138,7 +169,14 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        return user_with_profiles(self.request.user)
+
+    def retrieve(self, request, *args, **kwargs):
+        # Served from the profile cache, which the user signals drop on change; built on a miss
+        blob = cache.get(profile_cache_key(request.user.pk))
+        if blob is None:
+            blob = cache_profile(self.get_object())
+        return HttpResponse(blob, content_type='application/json')
 
 
 class FarmerProfileView(generics.RetrieveUpdateAPIView):
@@ -146,64 +184,30 @@ class FarmerProfileView(generics.RetrieveUpdateAPIView):
     Get and update farmer profile (create if doesn't exist)
     """
     serializer_class = FarmerProfileSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsFarmer]
+
+    def get_queryset(self):
+        return self.serializer_class.setup_eager_loading(FarmerProfile.objects.all())
 
     def get_object(self):
-        user = self.request.user
-        if not user.is_farmer:
-            return Response(
-                {'error': 'Only farmers can access this endpoint'}, 
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        profile, created = FarmerProfile.objects.get_or_create(user=user)
+        profile, created = self.get_queryset().get_or_create(user=self.request.user)
         return profile
 
-    def retrieve(self, request, *args, **kwargs):
-        try:
-            instance = self.get_object()
-            if isinstance(instance, Response):  # Error response
-                return instance
-            serializer = self.get_serializer(instance)
-            return Response(serializer.data)
-        except Exception as e:
-            return Response(
-                {'error': 'Profile not found'}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
-
 
 class BuyerProfileView(generics.RetrieveUpdateAPIView):
     """
     Get and update buyer profile (create if doesn't exist)
     """
     serializer_class = BuyerProfileSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsBuyer]
+
+    def get_queryset(self):
+        return self.serializer_class.setup_eager_loading(BuyerProfile.objects.all())
 
     def get_object(self):
-        user = self.request.user
-        if not user.is_buyer:
-            return Response(
-                {'error': 'Only buyers can access this endpoint'}, 
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        profile, created = BuyerProfile.objects.get_or_create(user=user)
+        profile, created = self.get_queryset().get_or_create(user=self.request.user)
         return profile
 
-    def retrieve(self, request, *args, **kwargs):
-        try:
-            instance = self.get_object()
-            if isinstance(instance, Response):  # Error response
-                return instance
-            serializer = self.get_serializer(instance)
-            return Response(serializer.data)
-        except Exception as e:
-            return Response(
-                {'error': 'Profile not found'}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
-
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -211,19 +215,23 @@ def user_dashboard(request):
     """
     Get user dashboard data based on user type
     """
-    user = request.user
+    user = user_with_profiles(request.user)
     
+    user_data = serialize_user(user)
     dashboard_data = {
-        'user': UserProfileSerializer(user).data,
+        'user': user_data,
         'profile_completion': 0,
-        'profile_exists': user.has_profile,
+        'profile_exists': user_data['has_profile'],
     }
     
-    if user.is_farmer and hasattr(user, 'farmer_profile'):
-        dashboard_data['profile_completion'] = user.farmer_profile.completion_percentage
-        dashboard_data['profile'] = FarmerProfileSerializer(user.farmer_profile).data
-    elif user.is_buyer and hasattr(user, 'buyer_profile'):
-        dashboard_data['profile_completion'] = user.buyer_profile.completion_percentage
-        dashboard_data['profile'] = BuyerProfileSerializer(user.buyer_profile).data
+    # has_profile already checked the joined profile relation, so the profile is only
+    # read when it exists. It embeds the same user data, handed over instead of serialized twice
+    if user_data['has_profile']:
+        if user.is_farmer:
+            profile, serializer_class = user.farmer_profile, FarmerProfileSerializer
+        else:
+            profile, serializer_class = user.buyer_profile, BuyerProfileSerializer
+        dashboard_data['profile_completion'] = profile.completion_percentage
+        dashboard_data['profile'] = serializer_class(profile, context={'user_info': user_data}).data
     
     return Response(dashboard_data)
\ No newline at end of file